@@ -2,21 +2,137 @@ import csv
 import os
 import sys
 from collections import defaultdict, Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from time import perf_counter
+from typing import Iterator
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pa_csv
 
 from fakeidentities.first_names import FirstNames
-from fakeidentities.match import PureMatch, PhoneticMatch
-from fakeidentities.utils import out_data_file
+from fakeidentities.match import Match, PureMatch, PhoneticMatch
+from fakeidentities.ngram_index import NGramIndex
+from fakeidentities.utils import bounded_map_unordered, out_data_file
+
+US_NAMES_FILE = '../data_raw/US.csv'
+FIRST_NAMES_INDEX_FILE = out_data_file("first_names_index.npz")
+CSV_BLOCK_SIZE = 16 << 20
+TYPOS_CHUNK_SIZE = 10_000
+WORKERS = 8
 
 lookup = FirstNames()
+# resolution of every first name seen by this process
+resolved_names: dict[str, Match | None] = {}
+
+
+def load_or_build_index(path: str) -> NGramIndex:
+    """The index saved at `path` if it was built from the current vocabulary, else a new one (saved at `path`)."""
+    if os.path.exists(path):
+        index = NGramIndex.load(path)
+        if index.matches_vocabulary(lookup.vocabulary):
+            lookup.index = index
+            return index
+    index = NGramIndex.build(lookup.vocabulary)
+    lookup.index = index
+    index.save(path)
+    return index
+
+
+def init_counter():
+    # one scoring thread per process: the pool already runs one process per core
+    lookup.scoring_workers = 1
+
+
+def init_worker(index_path: str):
+    # workers load the index saved by the parent instead of building their own
+    lookup.index = NGramIndex.load(index_path)
+
+
+@dataclass
+class NameCounts:
+    """Occurrences of the names of US.csv, by how they resolve; chunk counts are merged with `update`."""
+    # occurrences of the first names matched exactly, by matched name
+    matches: Counter = field(default_factory=Counter)
+    # occurrences of the first names matched phonetically, by matched name then typed name
+    phonetics: defaultdict = field(default_factory=lambda: defaultdict(Counter))
+    unknown: set = field(default_factory=set)
+    middlenames: Counter = field(default_factory=Counter)
+
+    def update(self, other: 'NameCounts'):
+        self.matches.update(other.matches)
+        for name, typed in other.phonetics.items():
+            self.phonetics[name].update(typed)
+        self.unknown.update(other.unknown)
+        self.middlenames.update(other.middlenames)
+
+
+def read_first_names(path: str) -> Iterator[pa.Array]:
+    """
+    First column of a header-less CSV, in chunks of about `CSV_BLOCK_SIZE` bytes.
+    The pyarrow reader rejects rows with a different number of columns than the first one: their first field
+    is parsed with `csv` instead, and yielded after the chunk they were found in. Their count is reported on stderr.
+    """
+    uneven_rows: list[str] = []
 
+    def keep_uneven_row(row) -> str:
+        uneven_rows.append(row.text)
+        return "skip"
 
-def collect_typos(word: str) -> (str, str):
-    nearest_neighbour = lookup.nearest_neighbour(word)
-    if word:
-        return nearest_neighbour, word
+    reader = pa_csv.open_csv(
+        path,
+        read_options=pa_csv.ReadOptions(autogenerate_column_names=True, block_size=CSV_BLOCK_SIZE),
+        parse_options=pa_csv.ParseOptions(invalid_row_handler=keep_uneven_row),
+        convert_options=pa_csv.ConvertOptions(include_columns=["f0"], column_types={"f0": pa.string()}),
+    )
+    uneven_count = 0
+    for batch in reader:
+        yield batch.column(0)
+        if uneven_rows:
+            uneven_count += len(uneven_rows)
+            yield pa.array([row[0] for row in csv.reader(uneven_rows) if row], type=pa.string())
+            uneven_rows.clear()
+    if uneven_count:
+        print(f"{path}: {uneven_count} rows with an uneven number of columns, read with csv", file=sys.stderr)
+
+
+def count_chunk(first_names: pa.Array) -> NameCounts:
+    """
+    Counts the distinct first names (and middle names, after a space) of a chunk,
+    and resolves the ones this process has not seen yet.
+    """
+    counts = NameCounts()
+    parts = pc.split_pattern(first_names, " ", max_splits=2)
+    with_middle = pc.match_substring(first_names, " ")
+    counts.middlenames.update(dict(value_counts(pc.list_element(pc.filter(parts, with_middle), 1))))
+    first_name_counts = value_counts(pc.list_element(parts, 0))
+    pending = [first_name for first_name, _ in first_name_counts if first_name not in resolved_names]
+    resolved_names.update(zip(pending, lookup.matches_many(pending)))
+    for first_name, count in first_name_counts:
+        match resolved_names[first_name]:
+            case PhoneticMatch(matched):
+                counts.phonetics[matched][first_name] += count
+            case PureMatch(matched):
+                counts.matches[matched] += count
+            case None:
+                counts.unknown.add(first_name)
+    return counts
+
+
+def value_counts(values: pa.Array) -> list[tuple[str, int]]:
+    counts = pc.value_counts(values)
+    return list(zip(counts.field("values").to_pylist(), counts.field("counts").to_pylist()))
+
+
+def collect_typos(words: list[str]) -> list[tuple[str, str]]:
+    """(intended, typed) pairs of the words that have a known first name close enough."""
+    return [
+        (nearest_neighbour, word)
+        for word, nearest_neighbour in zip(words, lookup.nearest_neighbours(words))
+        if word and nearest_neighbour is not None
+    ]
 
 if __name__ == '__main__':
     before = perf_counter()
@@ -26,58 +142,42 @@ if __name__ == '__main__':
     # print(group_by_name_sorted_desc(random_lastname_sample(100_000, seed)))
 
     # print(group_by_name_sorted_desc(golden_record_persons(sample_size, seed)))
-    middlenames = set()
-    unknown = set()
-    phonetics = defaultdict(list)
-    matches = Counter()
-    with open('../data_raw/US.csv', 'r') as f:
-        reader = csv.reader(f, delimiter=',')
-        for i, line in enumerate(reader):
-            first_name = line[0]
-            if " " in first_name:
-                splitt = first_name.split(" ")
-                first_name = splitt[0]
-                middlenames.add(splitt[1])
-
-            match lookup.matches(first_name):
-                case PhoneticMatch(matched):
-                    phonetics[matched].append(first_name)
-                case PureMatch(matched):
-                    matches.update([matched])
-                case None:
-                    unknown.add(first_name)
-
-#            if len(unknown) > 1_000_000:
-#                break
-            if i % 1000 == 0:
-                sys.stdout.write(f"\r {i}")
-                sys.stdout.flush()
-
-    phonetics = { name: Counter(typed) for name, typed in phonetics.items() }
+    counts = NameCounts()
+    # chunks are read as workers free up, and counts merged as they come back
+    with ProcessPoolExecutor(WORKERS, initializer=init_counter) as executor:
+        chunks_counts = bounded_map_unordered(executor, count_chunk, read_first_names(US_NAMES_FILE), max_pending=2 * WORKERS)
+        for i, chunk_counts in enumerate(chunks_counts):
+            counts.update(chunk_counts)
+            sys.stdout.write(f"\r {i + 1} chunks")
+            sys.stdout.flush()
+    matches = counts.matches
+    unknown = counts.unknown
+
+    phonetics = { name: Counter(typed) for name, typed in counts.phonetics.items() }
     for name, count in matches.items():
         if name in phonetics:
             phonetics[name].update({name: count})
         else:
             phonetics[name] = Counter({name: count})
 
-    """
-    with ProcessPoolExecutor(8) as executor:
-        typo_pairs = [res for res in executor.map(collect_typos, unknown) if res is not None]
-    
+    load_or_build_index(FIRST_NAMES_INDEX_FILE)
+    unknown = sorted(unknown)
+    chunks = [unknown[i:i + TYPOS_CHUNK_SIZE] for i in range(0, len(unknown), TYPOS_CHUNK_SIZE)]
+    with ProcessPoolExecutor(WORKERS, initializer=init_worker, initargs=(FIRST_NAMES_INDEX_FILE,)) as executor:
+        typo_pairs = [pair for pairs in executor.map(collect_typos, chunks) for pair in pairs]
+
     after = perf_counter()
     print(f"Finished in {after - before}")
 
     typos = defaultdict(set)
     for intended, typed in typo_pairs:
-        if intended is not None:
-            typos[intended].add(typed)
+        typos[intended].add(typed)
 
     print("-----")
     print("Typos")
     for intended, typed in typos.items():
         print(f"{intended} -> {typed}")
 
-    """
     rows = [
         {"name": name, "alternative_name": alt_name, "occurrences": count}
         for name, alternatives in phonetics.items()
@@ -1,19 +1,115 @@
-from datetime import datetime
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
 from random import random
+from typing import Callable, Iterator
 
 from faker import Faker
 
 
 from fakeidentities.person import Person
+from fakeidentities.person_table import PersonTable
 from fakeidentities.utils import raw_data_file, out_data_file
 import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+from pyarrow import csv as pa_csv
 
 import csv
 
 
-ALL_BABY_NAMES: pd.DataFrame = pd.read_csv(raw_data_file("baby-names.csv"))
-NAMES_2010: pd.DataFrame = pd.read_csv(raw_data_file("Names_2010Census.csv"))
-NAMES_ALTERNATIVES: pd.DataFrame = pd.read_parquet(out_data_file("name_alternatives.parquet"))
+@dataclass(frozen=True)
+class Dataset:
+    path: str
+    read: Callable[[str], pd.DataFrame]
+
+
+# reference datasets, loaded on first access as module attributes (`data.ALL_BABY_NAMES`)
+DATASETS = {
+    "ALL_BABY_NAMES": Dataset(raw_data_file("baby-names.csv"), pd.read_csv),
+    "NAMES_2010": Dataset(raw_data_file("Names_2010Census.csv"), pd.read_csv),
+    "NAMES_ALTERNATIVES": Dataset(out_data_file("name_alternatives.parquet"), pd.read_parquet),
+}
+ALL_BABY_NAMES: pd.DataFrame
+NAMES_2010: pd.DataFrame
+NAMES_ALTERNATIVES: pd.DataFrame
+
+# parsed datasets are cached as uncompressed Feather files, memory-mapped when read back
+USE_DATASET_CACHE = True
+DATASET_CACHE_DIR = out_data_file("cache")
+CACHE_SOURCE_KEY = b"fakeidentities.source"
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_stamp(path: str, sha256: str | None = None) -> dict:
+    stat = os.stat(path)
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha256": sha256 or file_sha256(path)}
+
+
+def read_cached(path: str, cache_path: str) -> pd.DataFrame | None:
+    """
+    The cached table of `path`, if `path` did not change since it was cached: same mtime and size,
+    or else same content hash. None when there is no valid cache entry.
+    """
+    if not os.path.exists(cache_path):
+        return None
+    table = feather.read_table(cache_path, memory_map=True)
+    stamp = json.loads((table.schema.metadata or {}).get(CACHE_SOURCE_KEY, b"{}"))
+    stat = os.stat(path)
+    if (stamp.get("mtime_ns"), stamp.get("size")) != (stat.st_mtime_ns, stat.st_size):
+        sha256 = file_sha256(path)
+        if stamp.get("sha256") != sha256:
+            return None
+        # only touched: the entry is kept, with the new mtime
+        write_cached(table, cache_path, source_stamp(path, sha256))
+    return table.to_pandas()
+
+
+def write_cached(table: pa.Table, cache_path: str, stamp: dict):
+    metadata = {**(table.schema.metadata or {}), CACHE_SOURCE_KEY: json.dumps(stamp).encode()}
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    # written aside then renamed: the previous entry may still be memory-mapped, and other processes may be
+    # writing the same entry (each one writes its own temporary file)
+    with tempfile.NamedTemporaryFile(dir=os.path.dirname(cache_path), suffix=".tmp", delete=False) as tmp:
+        tmp_path = tmp.name
+    try:
+        feather.write_feather(table.replace_schema_metadata(metadata), tmp_path, compression="uncompressed")
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def load_dataset(name: str, use_cache: bool | None = None) -> pd.DataFrame:
+    """Reads dataset `name` from its source file, or from its Feather cache entry when still valid."""
+    dataset = DATASETS[name]
+    if not (USE_DATASET_CACHE if use_cache is None else use_cache):
+        return dataset.read(dataset.path)
+    cache_path = os.path.join(DATASET_CACHE_DIR, f"{name}.feather")
+    df = read_cached(dataset.path, cache_path)
+    if df is None:
+        stamp = source_stamp(dataset.path)
+        df = dataset.read(dataset.path)
+        write_cached(pa.Table.from_pandas(df, preserve_index=False), cache_path, stamp)
+    return df
+
+
+def __getattr__(name: str):
+    if name in DATASETS:
+        value = load_dataset(name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 suffixes = { "MD", "DDS", "PhD", "DVM", "Jr.", "II", "III", "IV", "V" }
 prefixes = { "Mrs.", "Ms.", "Miss", "Dr.", "Mr.", "Dr.", "Mx.", "Ind.", "Misc.", "Dr." }
@@ -42,11 +138,52 @@ def golden_record_persons(size: int, seed: int) -> pd.DataFrame:
     more_than_3 = [name for name in names if len(name.split()) > 3]
     return pd.DataFrame(more_than_3, columns=['name'])
 
-def load_golden_records() -> list[Person]:
-    def change_type(line) -> dict:
-        line["date_of_birth"] = datetime.strptime(line["date_of_birth"], "%Y-%M-%d").date()
-        return line
+GOLDEN_RECORDS_CHUNK_ROWS = 1_000_000
+
+
+def golden_records_file(fmt: str = "csv") -> str:
+    return out_data_file(f"golden_records_nodes.{fmt}")
+
+
+def golden_csv_options(path: str) -> pa_csv.ConvertOptions:
+    """Every column is read as a string (keeping leading zeros), except `date_of_birth`; empty values are null."""
+    with open(path, newline="") as f:
+        header = next(csv.reader(f))
+    column_types = {name: pa.date32() if name == "date_of_birth" else pa.string() for name in header}
+    return pa_csv.ConvertOptions(column_types=column_types, null_values=[""], strings_can_be_null=True)
+
+
+def read_golden_arrow(path: str) -> pa.Table:
+    if path.endswith(".parquet"):
+        return pq.read_table(path)
+    return pa_csv.read_csv(path, convert_options=golden_csv_options(path))
+
+
+def load_golden_table(path: str | None = None) -> PersonTable:
+    """Golden records (CSV or Parquet, by extension) as a `PersonTable`."""
+    return PersonTable.from_arrow(read_golden_arrow(path or golden_records_file()))
+
+
+def load_golden_records(path: str | None = None) -> list[Person]:
+    return load_golden_table(path).to_persons()
+
 
-    with open(out_data_file("golden_records_nodes.csv")) as f:
-        reader = csv.DictReader(f)
-        return [Person(**change_type(line)) for line in reader]
+def iter_golden_tables(path: str | None = None, chunk_rows: int = GOLDEN_RECORDS_CHUNK_ROWS) -> Iterator[PersonTable]:
+    """Golden records in consecutive chunks of `chunk_rows` (the last one may be smaller), read as a stream."""
+    path = path or golden_records_file()
+    if path.endswith(".parquet"):
+        batches = pq.ParquetFile(path).iter_batches(batch_size=chunk_rows)
+    else:
+        batches = pa_csv.open_csv(path, convert_options=golden_csv_options(path))
+    pending = []
+    pending_rows = 0
+    for batch in batches:
+        pending.append(batch)
+        pending_rows += batch.num_rows
+        while pending_rows >= chunk_rows:
+            table = pa.Table.from_batches(pending)
+            yield PersonTable.from_arrow(table.slice(0, chunk_rows))
+            pending = table.slice(chunk_rows).to_batches()
+            pending_rows -= chunk_rows
+    if pending_rows:
+        yield PersonTable.from_arrow(pa.Table.from_batches(pending))
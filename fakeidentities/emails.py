@@ -0,0 +1,65 @@
+import numpy as np
+from faker import Faker
+
+from fakeidentities.utils import sanitize_string
+
+EMAIL_SEPARATORS = np.array([".", "-", "_", ""], dtype=object)
+
+
+def sanitize_many(values: np.ndarray) -> np.ndarray:
+    """`sanitize_string` applied once per distinct value."""
+    sanitized = {value: sanitize_string(value) for value in set(values.tolist())}
+    return np.array([sanitized[value] for value in values.tolist()], dtype=object)
+
+
+def initials(values: np.ndarray) -> np.ndarray:
+    return np.array([value[:1] for value in values.tolist()], dtype=object)
+
+
+class EmailFactory:
+    """
+    Batch counterpart of `golden_records.fake_mail`, with the same patterns and probabilities.
+    Domains and nickname words are drawn from pools sampled once from Faker,
+    and local parts are assembled with column operations on already-sanitized names.
+    """
+
+    def __init__(self, generator: Faker, pool_size: int = 10_000):
+        self.free_domains = np.array([generator.free_email_domain() for _ in range(pool_size)], dtype=object)
+        self.corporate_domains = np.array([generator.domain_name() for _ in range(pool_size)], dtype=object)
+        self.words = np.array([generator.word() for _ in range(pool_size)], dtype=object)
+
+    @staticmethod
+    def _pick(pool: np.ndarray, size: int, rng: np.random.Generator) -> np.ndarray:
+        return pool[rng.integers(0, len(pool), size=size)]
+
+    def corporate_emails(self, firstnames: np.ndarray, lastnames: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """`firstnames` and `lastnames` must already be sanitized (see `sanitize_many`)."""
+        size = len(firstnames)
+        seps = self._pick(EMAIL_SEPARATORS, size, rng)
+        # pattern is closer to firstname-lastname or flastname or f.lastname
+        full_firstname = rng.random(size) < 0.5
+        first_part = np.where(full_firstname, firstnames, initials(firstnames))
+        return first_part + seps + lastnames + "@" + self._pick(self.corporate_domains, size, rng)
+
+    def personal_emails(self, firstnames: np.ndarray, lastnames: np.ndarray, birth_years: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """`firstnames` and `lastnames` must already be sanitized (see `sanitize_many`)."""
+        size = len(firstnames)
+        seps = self._pick(EMAIL_SEPARATORS, size, rng)
+        full_firstname = rng.random(size) < 0.5
+        # it may include a number: a random one, or the birth year (full or last 2 digits)
+        number_rnd = rng.random(size)
+        full_year = rng.random(size) < 0.5
+        numbers = np.where(
+            number_rnd < 0.33,
+            (rng.random(size) * 100).astype(int),
+            np.where(full_year, birth_years, birth_years % 100),
+        )
+        # like `fake_mail`, a 0 is not appended
+        with_number = (number_rnd < 0.66) & (numbers != 0)
+        suffixes = np.where(with_number, numbers.astype(str).astype(object), "")
+        # then it may use firstname lastname or a nickname (anonymous address)
+        uses_nickname = rng.random(size) < 0.3
+        nicknames = self._pick(self.words, size, rng) + self._pick(self.words, size, rng)
+        names = np.where(full_firstname, firstnames, initials(firstnames)) + seps + lastnames
+        identifiers = np.where(uses_nickname, nicknames, names)
+        return identifiers + suffixes + "@" + self._pick(self.free_domains, size, rng)
@@ -0,0 +1,195 @@
+"""
+Faker-free, vectorized replacements for the `en_US` address, phone number, SSN and uuid4 providers.
+
+Components (street suffixes, city prefixes/suffixes, states, name weights) and format rules are
+loaded once from Faker's `en_US` provider classes, and values are then assembled for a whole batch
+with NumPy, following the same templates and distributions as Faker.
+"""
+import numpy as np
+from faker.providers.address.en_US import Provider as AddressProvider
+from faker.providers.person.en_US import Provider as PersonProvider
+from faker.providers.phone_number.en_US import Provider as PhoneProvider
+
+
+class WeightedPool:
+    """Values with sampling weights (uniform when none), sampled by binary search on cumulative weights."""
+
+    def __init__(self, elements):
+        if isinstance(elements, dict):
+            self.values = np.array(list(elements.keys()), dtype=object)
+            self.cumulative = np.cumsum(np.array(list(elements.values()), dtype=float))
+        else:
+            self.values = np.array(list(elements), dtype=object)
+            self.cumulative = np.arange(1, len(self.values) + 1, dtype=float)
+
+    def sample(self, size: int, rng: np.random.Generator) -> np.ndarray:
+        picks = np.searchsorted(self.cumulative, rng.random(size) * self.cumulative[-1], side="right")
+        return self.values[np.minimum(picks, len(self.values) - 1)]
+
+
+def to_strings(chars: np.ndarray) -> np.ndarray:
+    """(n, width) matrix of ASCII codes to an object array of n strings."""
+    width = chars.shape[1]
+    return np.ascontiguousarray(chars, dtype=np.uint8).view(f"S{width}")[:, 0].astype(f"U{width}").astype(object)
+
+
+def numbers_as_digits(numbers: np.ndarray, width: int) -> np.ndarray:
+    """Zero-padded decimal digits of `numbers` as a (n, width) matrix of ASCII codes."""
+    powers = 10 ** np.arange(width - 1, -1, -1)
+    return (numbers[:, None] // powers % 10 + ord("0")).astype(np.uint8)
+
+
+def numerify(pattern: str, size: int, rng: np.random.Generator) -> np.ndarray:
+    """Vectorized `Faker.numerify` for '#' (0-9) and '$' (2-9) placeholders."""
+    if not size:
+        return np.empty(0, dtype=object)
+    chars = np.tile(np.frombuffer(pattern.encode("ascii"), dtype=np.uint8), (size, 1))
+    for placeholder, low in (("#", 0), ("$", 2)):
+        positions = np.flatnonzero(chars[0] == ord(placeholder))
+        if len(positions):
+            chars[:, positions] = rng.integers(low, 10, size=(size, len(positions))) + ord("0")
+    return to_strings(chars)
+
+
+def numerify_choice(patterns, size: int, rng: np.random.Generator) -> np.ndarray:
+    """Picks one of `patterns` uniformly for every value, then numerifies each pattern group at once."""
+    picks = rng.integers(0, len(patterns), size=size)
+    result = np.empty(size, dtype=object)
+    for idx, pattern in enumerate(patterns):
+        mask = picks == idx
+        result[mask] = numerify(pattern, int(mask.sum()), rng)
+    return result
+
+
+HEX_DIGITS = np.frombuffer(b"0123456789abcdef", dtype=np.uint8)
+# positions of the 32 hex digits in the 36 characters of a canonical uuid
+UUID_HEX_POSITIONS = np.array([i for i in range(36) if i not in (8, 13, 18, 23)])
+
+
+def random_uuids(size: int, rng: np.random.Generator) -> list[str]:
+    """Canonical version 4 uuids, as `str(uuid.uuid4())`."""
+    raw = np.frombuffer(rng.bytes(16 * size), dtype=np.uint8).reshape(size, 16).copy()
+    raw[:, 6] = raw[:, 6] & 0x0F | 0x40  # version 4
+    raw[:, 8] = raw[:, 8] & 0x3F | 0x80  # RFC 4122 variant
+    chars = np.full((size, 36), ord("-"), dtype=np.uint8)
+    chars[:, UUID_HEX_POSITIONS[0::2]] = HEX_DIGITS[raw >> 4]
+    chars[:, UUID_HEX_POSITIONS[1::2]] = HEX_DIGITS[raw & 0x0F]
+    return to_strings(chars).tolist()
+
+
+class FastProviders:
+    """
+    Batch generation of `en_US` addresses, phone numbers, SSNs and uuid4s.
+    Batch methods take a size and return arrays; the scalar methods (`address()`, ...) serve values from
+    buffers refilled `buffer_size` at a time, so per-person code paths can use them too.
+    """
+
+    def __init__(self, rng: np.random.Generator | None = None, buffer_size: int = 10_000):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.buffer_size = buffer_size
+        self._buffers: dict[str, list] = {}
+        self.first_names = WeightedPool(PersonProvider.first_names)
+        self.last_names = WeightedPool(PersonProvider.last_names)
+        self.street_suffixes = WeightedPool(AddressProvider.street_suffixes)
+        self.city_prefixes = WeightedPool(AddressProvider.city_prefixes)
+        self.city_suffixes = WeightedPool(AddressProvider.city_suffixes)
+        self.states = WeightedPool(
+            AddressProvider.states_abbr + AddressProvider.territories_abbr + AddressProvider.freely_associated_states_abbr
+        )
+        self.military_states = WeightedPool(AddressProvider.military_state_abbr)
+        self.military_ships = WeightedPool(AddressProvider.military_ship_prefix)
+        self.address_formats = list(AddressProvider.address_formats.keys())
+        self.address_weights = np.array(list(AddressProvider.address_formats.values()), dtype=float)
+        self.address_weights /= self.address_weights.sum()
+
+    def postcodes(self, size: int) -> np.ndarray:
+        return to_strings(numbers_as_digits(self.rng.integers(501, 99951, size=size), 5))
+
+    # Components are picked as arrays, but strings are assembled in a single pass per template:
+    # chained `+` on object arrays allocates an intermediate string for every operator.
+
+    def cities(self, size: int) -> np.ndarray:
+        """`city_formats`: '{prefix} {first_name}{suffix}', '{prefix} {first_name}', '{first_name}{suffix}', '{last_name}{suffix}'."""
+        rng = self.rng
+        city_format = rng.integers(0, 4, size=size)
+        prefixes = np.where(city_format < 2, self.city_prefixes.sample(size, rng) + " ", "")
+        names = np.where(city_format < 3, self.first_names.sample(size, rng), self.last_names.sample(size, rng))
+        suffixes = np.where(city_format != 1, self.city_suffixes.sample(size, rng), "")
+        return np.array([
+            prefix + name + suffix for prefix, name, suffix in zip(prefixes.tolist(), names.tolist(), suffixes.tolist())
+        ], dtype=object)
+
+    def addresses(self, size: int) -> np.ndarray:
+        """Same templates and weights as `Faker('en_US').address()`, on a single line."""
+        rng = self.rng
+        template = rng.choice(len(self.address_formats), size=size, p=self.address_weights)
+        building_numbers = numerify_choice(AddressProvider.building_number_formats, size, rng)
+        street_names = np.where(rng.random(size) < 0.5, self.first_names.sample(size, rng), self.last_names.sample(size, rng))
+        street_suffixes = self.street_suffixes.sample(size, rng)
+        secondary = np.where(
+            rng.random(size) < 0.5, "", " " + numerify_choice(AddressProvider.secondary_address_formats, size, rng)
+        )
+        states = self.states.sample(size, rng)
+        postcodes = self.postcodes(size)
+        addresses = np.array([
+            f"{number} {name} {suffix}{secondary_address} {city}, {state} {postcode}"
+            for number, name, suffix, secondary_address, city, state, postcode in zip(
+                building_numbers.tolist(), street_names.tolist(), street_suffixes.tolist(), secondary.tolist(),
+                self.cities(size).tolist(), states.tolist(), postcodes.tolist(),
+            )
+        ], dtype=object)
+
+        # military addresses: '{head}\n{APO|FPO|DPO} {military_state} {postcode}'
+        for idx, address_format in enumerate(self.address_formats):
+            for kind in ("APO", "FPO", "DPO"):
+                if f"\n{kind} " not in address_format:
+                    continue
+                mask = template == idx
+                count = int(mask.sum())
+                if kind == "APO":
+                    heads = numerify(AddressProvider.military_apo_format, count, rng)
+                elif kind == "DPO":
+                    heads = numerify(AddressProvider.military_dpo_format, count, rng)
+                else:
+                    heads = self.military_ships.sample(count, rng) + " " + self.last_names.sample(count, rng)
+                addresses[mask] = [
+                    f"{head} {kind} {state} {postcode}"
+                    for head, state, postcode in zip(heads.tolist(), self.military_states.sample(count, rng).tolist(), postcodes[mask].tolist())
+                ]
+        return addresses
+
+    def phone_numbers(self, size: int) -> np.ndarray:
+        return numerify_choice(PhoneProvider.formats, size, self.rng)
+
+    def ssns(self, size: int) -> np.ndarray:
+        """Valid SSNs, as `Faker('en_US').ssn()`: area 001-899 except 666, group 01-99, serial 0001-9999."""
+        area = self.rng.integers(1, 900, size=size)
+        area[area == 666] += 1
+        group = self.rng.integers(1, 100, size=size)
+        serial = self.rng.integers(1, 10000, size=size)
+        dash = np.full((size, 1), ord("-"), dtype=np.uint8)
+        return to_strings(np.hstack([
+            numbers_as_digits(area, 3), dash, numbers_as_digits(group, 2), dash, numbers_as_digits(serial, 4)
+        ]))
+
+    def uuids(self, size: int) -> np.ndarray:
+        return np.array(random_uuids(size, self.rng), dtype=object)
+
+    def _next(self, name: str, batch) -> str:
+        buffer = self._buffers.get(name)
+        if not buffer:
+            buffer = batch(self.buffer_size).tolist()
+            self._buffers[name] = buffer
+        return buffer.pop()
+
+    def address(self) -> str:
+        return self._next("address", self.addresses)
+
+    def phone_number(self) -> str:
+        return self._next("phone_number", self.phone_numbers)
+
+    def ssn(self) -> str:
+        return self._next("ssn", self.ssns)
+
+    def uuid4(self) -> str:
+        return self._next("uuid4", self.uuids)
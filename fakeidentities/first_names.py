@@ -1,61 +1,124 @@
+import functools
 from collections import defaultdict
 from dataclasses import dataclass
+from typing import Iterable
 
 from fuzzy import nysiis
 
-from fakeidentities.data import ALL_BABY_NAMES
+from fakeidentities import data
 from nicknames import default_lookup
 
 from rapidfuzz import process
 from fakeidentities.match import PhoneticMatch, PureMatch, Match, NickNameMatch
+from fakeidentities.ngram_index import NGramIndex
+
+NYSIIS_CACHE_SIZE = 1_000_000
+# squared L2 distance between normalized n-gram vectors (2 - 2 * cosine)
+NEAREST_NEIGHBOUR_MAX_DISTANCE = 0.7
+
+
+@functools.lru_cache(NYSIIS_CACHE_SIZE)
+def nysiis_key(name: str) -> str:
+    return nysiis(name)
 
 
 @dataclass
 class FirstNames:
-
-    def __init__(self):
-        self._nickname_reverse_lookup = defaultdict(set)
-        self._all_first_names = list({ self._normalize(name) for name in ALL_BABY_NAMES['name'].to_list() })
-        self._phonetic_map = defaultdict(list)
+    """
+    Resolves candidate first names against a vocabulary (the baby names by default), by exact match,
+    then nickname, then NYSIIS key. Every tier is a hash lookup: the vocabulary is interned
+    (`_name_ids`), nicknames map to tuples of canonical names and NYSIIS keys to tuples of names.
+    Unknown names can be mapped to their nearest neighbour in an n-gram index of the vocabulary.
+    """
+
+    def __init__(self, names: Iterable[str] | None = None, index: NGramIndex | None = None, scoring_workers: int = -1):
+        if names is None:
+            names = data.ALL_BABY_NAMES['name'].to_list()
+        self._all_first_names = sorted({ self._normalize(name) for name in names })
+        self._name_ids = { name: i for i, name in enumerate(self._all_first_names) }
+        phonetic_map = defaultdict(list)
         for name in self._all_first_names:
-            self._phonetic_map[nysiis(name)].append(name)
+            phonetic_map[nysiis_key(name)].append(name)
+        self._phonetic_map = { sound: tuple(bucket) for sound, bucket in phonetic_map.items() }
+        nickname_reverse_lookup = defaultdict(set)
         nicknames_lookup = default_lookup()
         for canonical, associated_nicknames in nicknames_lookup.items():
             for nickname in associated_nicknames:
-                self._nickname_reverse_lookup[nickname].add(self._normalize(canonical))
-        # Build an ANN index using embeddings
-        # self._model = SentenceTransformer('all-MiniLM-L6-v2')
-        # embeddings = self._model.encode(self._all_first_names)
-        # self._first_names_embeddings = np.array(embeddings).astype("float32")
-        # dimension = self._first_names_embeddings.shape[1]
-        # self._index = faiss.IndexFlatL2(dimension)
-        # self._index.add(self._first_names_embeddings)
-
-
+                nickname_reverse_lookup[nickname].add(self._normalize(canonical))
+        self._nickname_reverse_lookup = { nickname: tuple(sorted(canonicals)) for nickname, canonicals in nickname_reverse_lookup.items() }
+        self._index = index
+        # threads of each `cdist` call (-1: all cores); 1 when already running in one of several processes
+        self.scoring_workers = scoring_workers
+
+    @property
+    def index(self) -> NGramIndex:
+        """N-gram index of the vocabulary, for typo recovery; built on first use unless given."""
+        if self._index is None:
+            self._index = NGramIndex.build(self._all_first_names)
+        return self._index
+
+    @property
+    def vocabulary(self) -> list[str]:
+        """Normalized known first names, sorted."""
+        return self._all_first_names
+
+    @index.setter
+    def index(self, index: NGramIndex):
+        self._index = index
 
     def first_name_matches(self, normalized_candidate: str) -> PureMatch | None:
-        return PureMatch(normalized_candidate) if normalized_candidate in self._all_first_names else None
+        return PureMatch(normalized_candidate) if normalized_candidate in self._name_ids else None
 
     def nickname_matches(self, normalized_candidate: str) -> NickNameMatch | None:
         matches = self._nickname_reverse_lookup.get(normalized_candidate)
         if matches:
-            return NickNameMatch(self._closest_match(normalized_candidate, list(matches)))
+            return NickNameMatch(self._closest_match(normalized_candidate, matches))
         return None
 
     def phonetic_matches(self, candidate: str) -> PhoneticMatch | None:
-        try:
-            sound = nysiis(candidate)
-            matches = self._phonetic_map.get(sound)
-            if matches:
-                return PhoneticMatch(self._closest_match(candidate, matches))
-        except Exception as e:
-            print(f"could not soundex: {candidate}: ", e)
+        matches = self._phonetic_map.get(self._sound(candidate))
+        if matches:
+            return PhoneticMatch(self._closest_match(candidate, matches))
         return None
 
     def matches(self, candidate: str) -> Match | None:
         if not candidate:
             return None
-        normalized = self._normalize(candidate)
+        return self._matches_normalized(self._normalize(candidate))
+
+    def matches_many(self, candidates: Iterable[str]) -> list[Match | None]:
+        """`matches` of every candidate, each distinct normalized candidate being resolved once."""
+        normalized = [self._normalize(candidate) if candidate else None for candidate in candidates]
+        resolved = self._resolve_many(candidate for candidate in dict.fromkeys(normalized) if candidate)
+        return [resolved[candidate] if candidate else None for candidate in normalized]
+
+    def _resolve_many(self, normalized_candidates: Iterable[str]) -> dict[str, Match | None]:
+        """
+        Same tiers as `matches`, but nickname and phonetic queries are grouped by candidate bucket
+        (the canonical names of a nickname, the names of a NYSIIS key), and each group is scored
+        with a single `cdist` call.
+        """
+        resolved = {}
+        by_nicknames = defaultdict(list)
+        by_sound = defaultdict(list)
+        for candidate in normalized_candidates:
+            if candidate in self._name_ids:
+                resolved[candidate] = PureMatch(candidate)
+            elif candidate in self._nickname_reverse_lookup:
+                by_nicknames[self._nickname_reverse_lookup[candidate]].append(candidate)
+            else:
+                sound = self._sound(candidate)
+                if sound in self._phonetic_map:
+                    by_sound[sound].append(candidate)
+                else:
+                    resolved[candidate] = None
+        for bucket, queries in by_nicknames.items():
+            resolved.update(zip(queries, map(NickNameMatch, self._closest_matches(queries, bucket))))
+        for sound, queries in by_sound.items():
+            resolved.update(zip(queries, map(PhoneticMatch, self._closest_matches(queries, self._phonetic_map[sound]))))
+        return resolved
+
+    def _matches_normalized(self, normalized: str) -> Match | None:
         fn_match = self.first_name_matches(normalized)
         if fn_match:
             return fn_match
@@ -67,15 +130,33 @@ class FirstNames:
         return self.phonetic_matches(normalized)
 
 
-    def _closest_match(self, normalized: str, candidates: list[str]) -> str:
-        scores = process.cdist([normalized], candidates)
-        return candidates[scores.argmax(axis=1)[0]]
+    def _closest_match(self, normalized: str, candidates: tuple[str, ...]) -> str:
+        return self._closest_matches([normalized], candidates)[0]
+
+    def _closest_matches(self, queries: list[str], candidates: tuple[str, ...]) -> list[str]:
+        """Best scoring candidate of each query, all queries being scored in one (multithreaded) call."""
+        if len(candidates) == 1:
+            return [candidates[0]] * len(queries)
+        scores = process.cdist(queries, candidates, workers=self.scoring_workers)
+        return [candidates[i] for i in scores.argmax(axis=1).tolist()]
+
+    @staticmethod
+    def _sound(candidate: str) -> str | None:
+        try:
+            return nysiis_key(candidate)
+        except Exception as e:
+            print(f"could not soundex: {candidate}: ", e)
+            return None
+
+    def nearest_neighbour(self, candidate: str, max_distance: float = NEAREST_NEIGHBOUR_MAX_DISTANCE) -> str | None:
+        return self.nearest_neighbours([candidate], max_distance)[0]
 
-    def nearest_neighbour(self, candidate: str) -> str | None:
-        query_embedding = self._model._metaphone_encode([self._normalize(candidate)]).astype("float32")
-        distances, indices = self._index.search(query_embedding, 1)
-        nearest_neighbour, distance = [(self._all_first_names[idx], distances[0][i]) for i, idx in enumerate(indices[0])][0]
-        return nearest_neighbour if distance < 0.15 else None
+    def nearest_neighbours(self, candidates: list[str], max_distance: float = NEAREST_NEIGHBOUR_MAX_DISTANCE) -> list[str | None]:
+        """Closest known first name of each candidate by character n-grams, None when none is close enough."""
+        normalized = [self._normalize(candidate) for candidate in candidates]
+        distinct = list(dict.fromkeys(normalized))
+        nearest = dict(zip(distinct, self.index.nearest(distinct, max_distance)))
+        return [nearest[candidate] for candidate in normalized]
 
     @staticmethod
     def _normalize(inp: str) -> str:
@@ -1,21 +1,33 @@
+import calendar
+import dataclasses
 import datetime
+import functools
 import math
+from typing import Callable, Iterable, Iterator
 
-import pandas as pd
+import numpy as np
+import pyarrow as pa
 from faker import Faker
 import random
 
-import networkx as nx
-from matplotlib.lines import Line2D
-
+from fakeidentities.emails import EmailFactory, sanitize_many
+from fakeidentities.fast_providers import FastProviders, random_uuids
 from fakeidentities.person import Person, Sex
-from fakeidentities.utils import out_data_file, sanitize_string
+from fakeidentities.person_table import PersonTable
+from fakeidentities.relationships import RelationshipGraph
+from fakeidentities.parse.address_parser import ADDRESS_COLUMNS, address_columns, parse_address_cached
+from fakeidentities.utils import ChunkedWriter, out_data_file, sanitize_string
 
 fake_US = Faker('en_US')
 fake_MX = Faker('es_MX')
 fake_IN = Faker('en_IN')
+LOCALES = [fake_US, fake_MX, fake_IN]
+LOCALE_WEIGHTS = [0.7, 0.2, 0.1] # a bit more diversity
 
 has_corp_email_prob = 0.4
+# size of the pre-sampled name pools used by the bulk generator
+name_pool_size = 10_000
+title_pool_size = 1_000
 
 def fake_mail(firstname: str, lastname: str, dob: datetime.date, is_corp: bool) -> str:
     base_mail = fake_US.company_email() if is_corp else fake_US.ascii_free_email()
@@ -50,10 +62,11 @@ def fake_mail(firstname: str, lastname: str, dob: datetime.date, is_corp: bool)
             identifier += str(number)
         return f"{identifier}@{domain}"
 
-def base_individuals(size):
+def base_individuals(size, fast_providers: bool = False):
+    providers = fast_US() if fast_providers else fake_US
     population = []
     for _ in range(size):
-        generator: Faker = random.choices([fake_US, fake_MX, fake_IN], weights=[0.7, 0.2, 0.1])[0] # a bit more diversity
+        generator: Faker = random.choices(LOCALES, weights=LOCALE_WEIGHTS)[0]
         dob = generator.date_of_birth(minimum_age=18, maximum_age=90)
         sex = random.choice([Sex.MALE, Sex.FEMALE])
         has_middlename = random.choice([True, False])
@@ -62,7 +75,7 @@ def base_individuals(size):
         has_suffix = has_title and not has_prefix
         firstname = generator.first_name_male() if sex == Sex.MALE else generator.first_name_female()
         lastname = generator.last_name()
-        address = fake_US.address().replace("\n", " ")
+        address = providers.address().replace("\n", " ")
         """
         while not address:
             candidate = fake_US.address().replace("\n", " ")
@@ -73,7 +86,7 @@ def base_individuals(size):
                 pass
         """
         person = Person(
-            unique_id=generator.uuid4(),
+            unique_id=(providers if fast_providers else generator).uuid4(),
             firstname=firstname,
             middlename=None if not has_middlename else generator.first_name_male() if sex == Sex.MALE else generator.first_name_female(),
             lastname=lastname,
@@ -82,14 +95,171 @@ def base_individuals(size):
             date_of_birth=dob,
             sex=sex,
             raw_address=address,
-            social_security_number=fake_US.ssn(),
+            social_security_number=providers.ssn(),
             personal_email=fake_mail(firstname, lastname, dob, False),
             corporate_email=fake_mail(firstname, lastname, dob, True) if random.random() < has_corp_email_prob else None,
-            phone=fake_US.phone_number(),
+            phone=providers.phone_number(),
         )
         population.append(person)
     return population
 
+@dataclasses.dataclass(frozen=True)
+class LocalePools:
+    """
+    Values drawn from one Faker locale ahead of time, so that the bulk generator
+    can pick names with a single array index instead of a provider call.
+    """
+    first_names: dict[Sex, np.ndarray]
+    prefixes: dict[Sex, np.ndarray]
+    suffixes: dict[Sex, np.ndarray]
+    last_names: np.ndarray
+
+    @staticmethod
+    def sample(generator: Faker, name_size: int, title_size: int) -> 'LocalePools':
+        def pool(provider, size) -> np.ndarray:
+            return np.array([provider() for _ in range(size)], dtype=object)
+
+        return LocalePools(
+            first_names={
+                Sex.MALE: pool(generator.first_name_male, name_size),
+                Sex.FEMALE: pool(generator.first_name_female, name_size),
+            },
+            prefixes={
+                Sex.MALE: pool(generator.prefix_male, title_size),
+                Sex.FEMALE: pool(generator.prefix_female, title_size),
+            },
+            suffixes={
+                Sex.MALE: pool(generator.suffix_male, title_size),
+                Sex.FEMALE: pool(generator.suffix_female, title_size),
+            },
+            last_names=pool(generator.last_name, name_size),
+        )
+
+
+@functools.cache
+def locale_pools(name_size: int = name_pool_size, title_size: int = title_pool_size) -> list[LocalePools]:
+    """Pools for every locale of `LOCALES`, in the same order. Sampled once per process."""
+    return [LocalePools.sample(generator, name_size, title_size) for generator in LOCALES]
+
+
+@functools.cache
+def email_factory() -> EmailFactory:
+    return EmailFactory(fake_US)
+
+
+@functools.cache
+def fast_US() -> FastProviders:
+    """Shared `FastProviders` for the per-person code paths, seeded from `random`."""
+    return FastProviders(np.random.default_rng(random.getrandbits(64)))
+
+
+def draw(pool: np.ndarray, mask: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    return pool[rng.integers(0, len(pool), size=int(mask.sum()))]
+
+
+def years_before(date: datetime.date, years: int) -> datetime.date:
+    """Same day `years` earlier; Feb 29 becomes Feb 28 when that year is not a leap year."""
+    if date.month == 2 and date.day == 29 and not calendar.isleap(date.year - years):
+        return date.replace(year=date.year - years, day=28)
+    return date.replace(year=date.year - years)
+
+
+def random_dates_of_birth(size: int, minimum_age: int, maximum_age: int, rng: np.random.Generator,
+                          today: datetime.date | None = None) -> np.ndarray:
+    """Same range as `Faker.date_of_birth`, drawn for a whole chunk as datetime64[D]."""
+    today = today or datetime.date.today()
+    start = np.datetime64(years_before(today, maximum_age + 1), 'D')
+    end = np.datetime64(years_before(today, minimum_age), 'D')
+    # Faker excludes the lower boundary
+    offsets = rng.integers(1, (end - start).astype(int) + 1, size=size)
+    return start + offsets
+
+
+def base_individuals_table(size: int, rng: np.random.Generator, fast_providers: bool = False) -> PersonTable:
+    """
+    Vectorized counterpart of `base_individuals`: every random decision (locale, sex, title,
+    middle name, date of birth) is drawn for the whole chunk at once, and names are picked
+    from pre-sampled locale pools. With `fast_providers`, addresses, SSNs and phones are
+    generated by `FastProviders` instead of Faker.
+    """
+    pools = locale_pools()
+    locale = rng.choice(len(LOCALES), size=size, p=LOCALE_WEIGHTS)
+    is_male = rng.random(size) < 0.5
+    has_middlename = rng.random(size) < 0.5
+    has_title = rng.random(size) < 0.2
+    has_prefix = has_title & (rng.random(size) < 0.5)
+    has_suffix = has_title & ~has_prefix
+    has_corp_email = rng.random(size) < has_corp_email_prob
+    dobs = random_dates_of_birth(size, minimum_age=18, maximum_age=90, rng=rng)
+
+    firstnames = np.empty(size, dtype=object)
+    lastnames = np.empty(size, dtype=object)
+    middlenames = np.full(size, None, dtype=object)
+    prefixes = np.full(size, None, dtype=object)
+    suffixes = np.full(size, None, dtype=object)
+    for idx, pool in enumerate(pools):
+        in_locale = locale == idx
+        lastnames[in_locale] = draw(pool.last_names, in_locale, rng)
+        for sex, sex_mask in ((Sex.MALE, is_male), (Sex.FEMALE, ~is_male)):
+            mask = in_locale & sex_mask
+            firstnames[mask] = draw(pool.first_names[sex], mask, rng)
+            middlenames[mask & has_middlename] = draw(pool.first_names[sex], mask & has_middlename, rng)
+            prefixes[mask & has_prefix] = draw(pool.prefixes[sex], mask & has_prefix, rng)
+            suffixes[mask & has_suffix] = draw(pool.suffixes[sex], mask & has_suffix, rng)
+
+    emails = email_factory()
+    clean_firstnames = sanitize_many(firstnames)
+    clean_lastnames = sanitize_many(lastnames)
+    birth_years = dobs.astype("datetime64[Y]").astype(int) + 1970
+    corporate_emails = np.full(size, None, dtype=object)
+    corporate_emails[has_corp_email] = emails.corporate_emails(clean_firstnames[has_corp_email], clean_lastnames[has_corp_email], rng)
+
+    if fast_providers:
+        providers = FastProviders(rng)
+        addresses, ssns, phones = providers.addresses(size), providers.ssns(size), providers.phone_numbers(size)
+    else:
+        addresses = np.array([fake_US.address().replace("\n", " ") for _ in range(size)], dtype=object)
+        ssns = np.array([fake_US.ssn() for _ in range(size)], dtype=object)
+        phones = np.array([fake_US.phone_number() for _ in range(size)], dtype=object)
+
+    return PersonTable({
+        "unique_id": np.array(random_uuids(size, rng), dtype=object),
+        "firstname": firstnames,
+        "middlename": middlenames,
+        "prefix": prefixes,
+        "suffix": suffixes,
+        "lastname": lastnames,
+        "date_of_birth": dobs,
+        "raw_address": addresses,
+        "social_security_number": ssns,
+        "sex": np.where(is_male, Sex.MALE.value, Sex.FEMALE.value).astype(np.int8),
+        "phone": phones,
+        "personal_email": emails.personal_emails(clean_firstnames, clean_lastnames, birth_years, rng),
+        "corporate_email": corporate_emails,
+    })
+
+
+def base_individuals_chunk(size: int, rng: np.random.Generator, fast_providers: bool = False) -> list[Person]:
+    return base_individuals_table(size, rng, fast_providers).to_persons()
+
+
+def iter_base_tables(size: int, chunk_size: int = 100_000, rng: np.random.Generator | None = None, fast_providers: bool = False) -> Iterator[PersonTable]:
+    """Yields `size` base individuals as `PersonTable` chunks of `chunk_size` rows."""
+    rng = rng if rng is not None else np.random.default_rng()
+    for start in range(0, size, chunk_size):
+        yield base_individuals_table(min(chunk_size, size - start), rng, fast_providers)
+
+
+def iter_base_individuals(size: int, chunk_size: int = 100_000, rng: np.random.Generator | None = None, fast_providers: bool = False) -> Iterator[list[Person]]:
+    """Yields `size` base individuals, `chunk_size` at a time."""
+    for table in iter_base_tables(size, chunk_size, rng, fast_providers):
+        yield table.to_persons()
+
+
+def base_individuals_bulk(size: int, chunk_size: int = 100_000, rng: np.random.Generator | None = None, fast_providers: bool = False) -> list[Person]:
+    return [person for chunk in iter_base_individuals(size, chunk_size, rng, fast_providers) for person in chunk]
+
+
 def expected_children(age: int, max_children=4, peak_age=30, sigma=10):
     # Gaussian-like curve for fertility
     return max_children * math.exp(-((age - peak_age) ** 2) / (2 * sigma ** 2))
@@ -114,8 +284,9 @@ def number_of_children_by_age(age):
     num_kids = min(4, max(0, round(random.gauss(expected_kids, 0.5))))  # Add some noise
     return num_kids
 
-def breed(partner_m: Person, partner_f: Person) -> Person:
-    generator: Faker = random.choices([fake_US, fake_MX, fake_IN], weights=[0.7, 0.2, 0.1])[0] # a bit more diversity
+def breed(partner_m: Person, partner_f: Person, fast_providers: bool = False) -> Person:
+    generator: Faker = random.choices(LOCALES, weights=LOCALE_WEIGHTS)[0]
+    providers = fast_US() if fast_providers else fake_US
     max_child_age = min(partner_f.age - 18, 25)  # Children’s ages must fit within parents' plausible range
     child_age = random.randint(0, max_child_age)
     dob = fake_US.date_of_birth(minimum_age=child_age, maximum_age=child_age)
@@ -124,7 +295,7 @@ def breed(partner_m: Person, partner_f: Person) -> Person:
     firstname = generator.first_name_male() if sex == Sex.MALE else generator.first_name_female()
     lastname = random.choices([partner_m.lastname, partner_m.lastname + " " + partner_f.lastname], weights=[0.75, 0.25])[0]
     return Person(
-        unique_id=generator.uuid4(),
+        unique_id=(providers if fast_providers else generator).uuid4(),
         firstname=firstname,
         middlename=None if not has_middlename else generator.first_name_male() if sex == Sex.MALE else generator.first_name_female(),
         lastname=lastname,
@@ -133,93 +304,153 @@ def breed(partner_m: Person, partner_f: Person) -> Person:
         date_of_birth=dob,
         sex=sex,
         raw_address=partner_m.raw_address,
-        social_security_number=fake_US.ssn(),
+        social_security_number=providers.ssn(),
         personal_email=fake_mail(firstname, lastname, dob, False),
         corporate_email=None,
-        phone=fake_US.phone_number()
+        phone=providers.phone_number()
     )
 
     
 
-def assign_children(partner_m: Person, partner_f: Person) -> list[Person]:
+def assign_children(partner_m: Person, partner_f: Person, fast_providers: bool = False) -> list[Person]:
     num_kids = number_of_children_by_age(partner_f.age)
-    return [breed(partner_m, partner_f) for _ in range(num_kids)]
+    return [breed(partner_m, partner_f, fast_providers) for _ in range(num_kids)]
 
 def assign_address(kid: Person, partner_M: Person, partner_F: Person) -> Person:
     new_address = random.choice([partner_M, partner_F]).raw_address
     return kid.move_at(new_address)
 
 
-def pair_couples(couple_percent: float, pop_m: set[Person], pop_f: set[Person]) -> nx.Graph:
-    population = nx.Graph()
+@dataclasses.dataclass
+class Household:
+    """A family unit (or a single person) with the relationships between its members."""
+    members: list[Person]
+    relationships: list[tuple[Person, Person, str]]
+
+
+def couple_household(partner_m: Person, partner_f: Person, fast_providers: bool = False) -> Household:
+    # assign children
+    kids = assign_children(partner_m, partner_f, fast_providers)
+    # have they divorced? (discarding re-marriage)
+    divorced = random.random() < 0.25
+    if not divorced:
+        choice = random.random()
+        if choice < 0.5:
+            partner_f = partner_f.with_lastname(partner_m.lastname)
+        elif choice < 0.8:
+            partner_f = partner_f.with_lastname(partner_f.lastname + " " + partner_m.lastname)
+        # let them live at the same place
+        partner_f = partner_f.move_at(partner_m.raw_address)
+    else:
+        # kids will live with one parent
+        kids = [ assign_address(kid, partner_m, partner_f) for kid in kids ]
+
+    relationships = [] if divorced else [(partner_m, partner_f, "couple")]
+    relationships += [(partner_m, kid, "parent") for kid in kids]
+    return Household(members=[partner_m, partner_f, *kids], relationships=relationships)
+
+
+def pair_households(couple_percent: float, pop_m: list, pop_f: list, fast_providers: bool = False, person: Callable[[int], Person] | None = None) -> Iterator[Household]:
+    """
+    Pairs `pop_m` and `pop_f` into couples where possible. They hold persons, or row indexes that `person`
+    turns into a `Person` only when their household is built.
+    """
+    person = person or (lambda p: p)
+    # shuffled lists rather than sets: pairing order then only depends on the `random` seed,
+    # not on the per-process string hash seed
+    random.shuffle(pop_m)
+    random.shuffle(pop_f)
     while pop_m:
-        current_person = pop_m.pop()
+        current_person = person(pop_m.pop())
         will_marry = random.random() < couple_percent
         if will_marry and pop_f:
             # try to find a partner
-            partner = pop_f.pop()
-            # assign children
-            kids = assign_children(current_person, partner)
-            # have they divorced? (discarding re-marriage)
-            divorced = random.random() < 0.25
-            if not divorced:
-                choice = random.random()
-                if choice < 0.5:
-                    partner = partner.with_lastname(current_person.lastname)
-                elif choice < 0.8:
-                    partner = partner.with_lastname(partner.lastname + " " + current_person.lastname)
-                # let them live at the same place
-                partner = partner.move_at(current_person.raw_address)
-            else:
-                # kids will live with one parent
-                kids = [ assign_address(kid, current_person, partner) for kid in kids ]
-
-            population.add_node(partner)
-            if not divorced:
-                population.add_edge(current_person, partner, relationship="couple")
-            for kid in kids:
-                population.add_node(kid)
-                population.add_edge(current_person, kid, relationship="parent")
-
-        population.add_node(current_person)
+            yield couple_household(current_person, person(pop_f.pop()), fast_providers)
+        else:
+            yield Household(members=[current_person], relationships=[])
 
     # leftovers
-    for single in pop_f.union(pop_m):
-        population.add_node(single)
+    for single in pop_f:
+        yield Household(members=[person(single)], relationships=[])
 
-    return population
 
+def iter_table_households(table: PersonTable, couple_percent: float = 0.75, fast_providers: bool = False) -> Iterator[Household]:
+    """
+    `iter_households` on a `PersonTable`: ages are computed once and rows are bucketed by age and sex with masks.
+    Rows only become `Person` objects when their household is built. Households (and the `random` draws) are the
+    same as for `table.to_persons()`.
+    """
+    age = table.age
+    male = table.sex == Sex.MALE.value
+    for i in np.flatnonzero(age < 25).tolist():
+        # untouched people
+        yield Household(members=[table.row(i)], relationships=[])
+    middle_age = (age >= 25) & (age < 50)
+    old = age >= 50
+    for bucket in (middle_age, old):
+        yield from pair_households(
+            couple_percent, np.flatnonzero(bucket & male).tolist(), np.flatnonzero(bucket & ~male).tolist(),
+            fast_providers, person=table.row,
+        )
 
-def random_families(individuals):
-    """Pairs individuals into couples where possible."""
-    # untouched people
-    population = nx.Graph()
-    males_middle_age: set[Person] = set()
-    females_middle_age: set[Person] = set()
-    males_old: set[Person] = set()
-    females_old: set[Person] = set()
+
+def iter_households(individuals: Iterable[Person] | PersonTable, couple_percent: float = 0.75, fast_providers: bool = False) -> Iterator[Household]:
+    """Pairs individuals into couples where possible, one household at a time."""
+    if isinstance(individuals, PersonTable):
+        yield from iter_table_households(individuals, couple_percent, fast_providers)
+        return
+    males_middle_age: list[Person] = []
+    females_middle_age: list[Person] = []
+    males_old: list[Person] = []
+    females_old: list[Person] = []
     for p in individuals:
         if p.age < 25:
-            population.add_node(p)
+            # untouched people
+            yield Household(members=[p], relationships=[])
         elif 25 <= p.age < 50:
             if p.sex == Sex.MALE:
-                males_middle_age.add(p)
+                males_middle_age.append(p)
             else:
-                females_middle_age.add(p)
+                females_middle_age.append(p)
         elif p.sex == Sex.MALE:
-            males_old.add(p)
+            males_old.append(p)
         else:
-            females_old.add(p)
+            females_old.append(p)
 
-    couple_percent = 0.75
     # try to pair middle age persons
-    population = nx.union(population, pair_couples(couple_percent, males_middle_age, females_middle_age))
-    population = nx.union(population, pair_couples(couple_percent, males_old, females_old))
+    yield from pair_households(couple_percent, males_middle_age, females_middle_age, fast_providers)
+    yield from pair_households(couple_percent, males_old, females_old, fast_providers)
+
+
+def stream_families(chunks: Iterable[list[Person] | PersonTable], couple_percent: float = 0.75, fast_providers: bool = False) -> Iterator[Household]:
+    """
+    Streaming counterpart of `random_families`: households are formed within each chunk of individuals
+    (e.g. from `iter_base_tables`), so only one chunk is held in memory at a time.
+    """
+    for chunk in chunks:
+        yield from iter_households(chunk, couple_percent, fast_providers)
+
+
+def add_households(population: RelationshipGraph, households: Iterable[Household]) -> RelationshipGraph:
+    for household in households:
+        population.add_household(household.members, household.relationships)
     return population
 
-def visualize_population(graph):
-    import matplotlib.pyplot as plt
+
+def pair_couples(couple_percent: float, pop_m: list[Person], pop_f: list[Person], fast_providers: bool = False) -> RelationshipGraph:
+    return add_households(RelationshipGraph(), pair_households(couple_percent, pop_m, pop_f, fast_providers))
+
+
+def random_families(individuals, fast_providers: bool = False) -> RelationshipGraph:
+    """Pairs individuals into couples where possible."""
+    return add_households(RelationshipGraph(), iter_households(individuals, fast_providers=fast_providers))
+
+def visualize_population(population: RelationshipGraph):
     """Visualizes the population graph with NetworkX and Matplotlib."""
+    import matplotlib.pyplot as plt
+    import networkx as nx
+    from matplotlib.lines import Line2D
+    graph = population.to_networkx()
     plt.figure(figsize=(15, 15))
 
     # Position nodes using a spring layout for clarity
@@ -227,7 +458,7 @@ def visualize_population(graph):
 
     # Separate edges by relationship type for coloring
     couple_edges = [(u, v) for u, v, d in graph.edges(data=True) if d["relationship"] == "couple"]
-    child_edges = [(u, v) for u, v, d in graph.edges(data=True) if d["relationship"] == "child"]
+    child_edges = [(u, v) for u, v, d in graph.edges(data=True) if d["relationship"] == "parent"]
 
     # Draw nodes
     nx.draw_networkx_nodes(graph, pos, node_size=300, node_color="skyblue")
@@ -253,10 +484,37 @@ def visualize_population(graph):
     plt.axis("off")
     plt.show()
 
+NODES_SCHEMA = pa.schema([
+    (field.name, pa.date32() if field.name == "date_of_birth" else pa.string())
+    for field in dataclasses.fields(Person)
+])
+# nodes with the `ParsedUSAddress` components of `raw_address` as extra columns
+NODES_WITH_ADDRESS_SCHEMA = pa.schema([
+    *NODES_SCHEMA,
+    *((column, pa.string()) for column in ADDRESS_COLUMNS.values()),
+])
+EDGES_SCHEMA = pa.schema([("src", pa.string()), ("dst", pa.string())])
+
+
+def write_households(households: Iterable[Household], nodes_path: str, edges_path: str, chunk_rows: int = 100_000, parsed_addresses: bool = False):
+    """
+    Writes nodes and edges of households as they are generated, as CSV or Parquet depending on
+    the file extension. At most `chunk_rows` rows of each are buffered.
+    With `parsed_addresses`, nodes also get the parsed components of their address (`ADDRESS_COLUMNS`).
+    """
+    nodes_schema = NODES_WITH_ADDRESS_SCHEMA if parsed_addresses else NODES_SCHEMA
+    with ChunkedWriter(nodes_path, nodes_schema, chunk_rows) as nodes, ChunkedWriter(edges_path, EDGES_SCHEMA, chunk_rows) as edges:
+        for household in households:
+            for member in household.members:
+                row = {**member.__dict__, "sex": str(member.sex)}
+                if parsed_addresses:
+                    # household members mostly share their address: parsed once
+                    row.update(address_columns(parse_address_cached(member.raw_address)))
+                nodes.write(row)
+            for src, dst, _ in household.relationships:
+                edges.write({"src": src.unique_id, "dst": dst.unique_id})
+
+
 if __name__ == '__main__':
-    base_pop = base_individuals(1000)
-    population: nx.Graph = random_families(base_pop)
-    persons = pd.DataFrame(population.nodes)
-    relationships = pd.DataFrame([(src.unique_id, dst.unique_id) for (src, dst) in population.edges], columns=["src", "dst"])
-    persons.to_csv(out_data_file("golden_records_nodes.csv"), index=False)
-    relationships.to_csv(out_data_file("golden_records_edges.csv"), index=False)
+    households = stream_families(iter_base_tables(1000))
+    write_households(households, out_data_file("golden_records_nodes.csv"), out_data_file("golden_records_edges.csv"))
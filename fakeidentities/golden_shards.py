@@ -0,0 +1,103 @@
+"""
+Sharded golden record generation.
+
+The population is split into independent shards, each one generated in its own worker process.
+Sharding rule: a shard pairs couples and assigns children among its own individuals only, so
+couples and parent/child edges never cross shards and shards can be merged by plain concatenation.
+"""
+import argparse
+import os
+import random
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pyarrow.parquet as pq
+
+from fakeidentities import golden_records
+from fakeidentities.golden_records import iter_base_tables, stream_families, write_households
+from fakeidentities.utils import out_data_file
+
+FORMATS = ("csv", "parquet")
+
+
+def shard_sizes(size: int, num_shards: int) -> list[int]:
+    return [size // num_shards + (1 if i < size % num_shards else 0) for i in range(num_shards)]
+
+
+def shard_file(name: str, shard_id: int, fmt: str) -> str:
+    return out_data_file(f"{name}.shard-{shard_id:05d}.{fmt}")
+
+
+def seed_shard(seed: int, shard_id: int) -> np.random.Generator:
+    """
+    Seeds every source of randomness used by the generators (`random`, the module-level Faker
+    instances) from (seed, shard_id), and returns the NumPy generator for the shard.
+    A shard therefore yields the same records whichever worker process runs it.
+    """
+    seq = np.random.SeedSequence([seed, shard_id])
+    states = seq.generate_state(len(golden_records.LOCALES) + 1)
+    random.seed(int(states[0]))
+    for generator, state in zip(golden_records.LOCALES, states[1:]):
+        generator.seed_instance(int(state))
+    # pools were sampled with the previous seed
+    golden_records.locale_pools.cache_clear()
+    golden_records.email_factory.cache_clear()
+    golden_records.fast_US.cache_clear()
+    return np.random.default_rng(seq)
+
+
+def generate_shard(shard_id: int, size: int, seed: int, fmt: str, fast_providers: bool = False, parsed_addresses: bool = False) -> tuple[str, str]:
+    rng = seed_shard(seed, shard_id)
+    nodes_path = shard_file("golden_records_nodes", shard_id, fmt)
+    edges_path = shard_file("golden_records_edges", shard_id, fmt)
+    individuals = iter_base_tables(size, rng=rng, fast_providers=fast_providers)
+    write_households(stream_families(individuals, fast_providers=fast_providers), nodes_path, edges_path, parsed_addresses=parsed_addresses)
+    return nodes_path, edges_path
+
+
+def merge_shards(shard_paths: list[str], out_path: str):
+    """Concatenates shard files (in the given order) into `out_path`, then removes them."""
+    if out_path.endswith(".parquet"):
+        # shards are all written with the same schema
+        with pq.ParquetWriter(out_path, pq.read_schema(shard_paths[0])) as writer:
+            for path in shard_paths:
+                writer.write_table(pq.read_table(path))
+    else:
+        with open(out_path, "w") as out:
+            for i, path in enumerate(shard_paths):
+                with open(path) as shard:
+                    header = shard.readline()
+                    if i == 0:
+                        out.write(header)
+                    shutil.copyfileobj(shard, out)
+    for path in shard_paths:
+        os.remove(path)
+
+
+def generate_sharded(size: int, num_shards: int, seed: int, workers: int | None = None, fmt: str = "csv", fast_providers: bool = False,
+                     parsed_addresses: bool = False) -> tuple[str, str]:
+    sizes = shard_sizes(size, num_shards)
+    with ProcessPoolExecutor(workers) as executor:
+        shards = list(executor.map(
+            generate_shard, range(num_shards), sizes, [seed] * num_shards, [fmt] * num_shards, [fast_providers] * num_shards,
+            [parsed_addresses] * num_shards,
+        ))
+    nodes_path = out_data_file(f"golden_records_nodes.{fmt}")
+    edges_path = out_data_file(f"golden_records_edges.{fmt}")
+    merge_shards([nodes for nodes, _ in shards], nodes_path)
+    merge_shards([edges for _, edges in shards], edges_path)
+    return nodes_path, edges_path
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generates golden records in independent shards")
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--shards", type=int, default=os.cpu_count())
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=1000)
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--fast-providers", action="store_true", help="generate addresses, phones and SSNs without Faker")
+    parser.add_argument("--parsed-addresses", action="store_true", help="also write the parsed address components as columns")
+    args = parser.parse_args()
+    generate_sharded(args.size, args.shards, args.seed, args.workers, args.format, args.fast_providers, args.parsed_addresses)
@@ -0,0 +1,22 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Match:
+    """A candidate first name resolved to a known (normalized) first name."""
+    matched: str
+
+
+@dataclass(frozen=True)
+class PureMatch(Match):
+    """The candidate is itself a known first name."""
+
+
+@dataclass(frozen=True)
+class NickNameMatch(Match):
+    """The candidate is a nickname of the matched name."""
+
+
+@dataclass(frozen=True)
+class PhoneticMatch(Match):
+    """The candidate sounds like the matched name (same NYSIIS key)."""
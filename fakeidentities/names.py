@@ -1,4 +1,9 @@
 import csv
+import functools
+from array import array
+from typing import AbstractSet, Iterable, Iterator, Mapping
+
+import numpy as np
 
 from fakeidentities.phonetics import PhoneticDict
 from fakeidentities.utils import raw_data_file
@@ -6,7 +11,9 @@ from fakeidentities.utils import raw_data_file
 suffixes = { "MD", "DDS", "PhD", "DVM", "Jr.", "II", "III", "IV", "V" }
 prefixes = { "Mrs.", "Ms.", "Miss", "Dr.", "Mr.", "Dr.", "Mx.", "Ind.", "Misc.", "Dr." }
 
-NameVariants = dict[str, set[str]]
+NameVariants = Mapping[str, AbstractSet[str]]
+# synonym sets kept for the most looked up names
+SYNONYMS_CACHE_SIZE = 10_000
 
 def make_name(name: str) -> str:
     return ' '.join([part.capitalize() for part in name.split(' ')])
@@ -16,37 +23,83 @@ def lastnames() -> list[str]:
         reader = csv.DictReader(f)
         return [entry['name'] for entry in reader]
 
-def givennames_synonyms() -> NameVariants:
-    res = {}
-    with open(raw_data_file("btn_givennames_synonyms.txt"), mode='r') as synonyms:
-        reader = csv.reader(synonyms, delimiter="\t")
-        for line in reader:
-            name = line[0].lower()
+class SynonymGroups(Mapping[str, frozenset[str]]):
+    """
+    Given name synonyms, stored as groups of interned name ids: every line of the synonyms file
+    (a name and its alternates) is a group, and the synonyms of a name are the other members of its groups.
+    Groups are not merged transitively: short names (e.g. "al") belong to many unrelated groups.
+    """
+
+    def __init__(self, names: list[str], group_indptr: np.ndarray, group_members: np.ndarray):
+        self.names = names
+        self.ids = {name: i for i, name in enumerate(names)}
+        # members of group g are `group_members[group_indptr[g]:group_indptr[g + 1]]`
+        self.group_indptr = group_indptr
+        self.group_members = group_members
+        # groups of name i are `name_groups[name_indptr[i]:name_indptr[i + 1]]`
+        member_groups = np.repeat(np.arange(len(group_indptr) - 1, dtype=np.int32), np.diff(group_indptr))
+        order = np.argsort(group_members, kind="stable")
+        self.name_groups = member_groups[order]
+        self.name_indptr = np.zeros(len(names) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(group_members, minlength=len(names)), out=self.name_indptr[1:])
+        self._synonyms = functools.lru_cache(SYNONYMS_CACHE_SIZE)(self._synonyms_of)
+
+    @staticmethod
+    def from_lines(lines: Iterable[list[str]]) -> 'SynonymGroups':
+        """Rows of the synonyms file: name, sex, comma separated alternates."""
+        ids: dict[str, int] = {}
+        group_indptr = array('q', [0])
+        group_members = array('i')
+        for line in lines:
             alternates = [alt.lower().strip() for alt in line[2].split(',')]
             if not alternates or alternates == ['']:
                 continue
-            if name not in res:
-                res[name] = set()
-            res[name] = res[name].union(set(alternates))
-            for alt in alternates:
-                if alt not in res:
-                    res[alt] = set()
-                others = set(alternates)
-                others.remove(alt)
-                others.add(name)
-                res[alt] = res[alt].union(others)
-    return res
+            # a name listed twice in a line is a single member
+            for name in dict.fromkeys([line[0].lower(), *alternates]):
+                group_members.append(ids.setdefault(name, len(ids)))
+            group_indptr.append(len(group_members))
+        return SynonymGroups(
+            list(ids),
+            np.frombuffer(group_indptr, dtype=np.int64),
+            np.frombuffer(group_members, dtype=np.int32),
+        )
+
+    def __getitem__(self, name: str) -> frozenset[str]:
+        return self._synonyms(name)
+
+    def _synonyms_of(self, name: str) -> frozenset[str]:
+        i = self.ids[name]
+        groups = self.name_groups[self.name_indptr[i]:self.name_indptr[i + 1]].tolist()
+        indptr = self.group_indptr
+        members = set()
+        for group in groups:
+            members.update(self.group_members[indptr[group]:indptr[group + 1]].tolist())
+        members.discard(i)
+        return frozenset(self.names[member] for member in members)
+
+    def __contains__(self, name) -> bool:
+        return name in self.ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+def givennames_synonyms() -> SynonymGroups:
+    with open(raw_data_file("btn_givennames_synonyms.txt"), mode='r') as synonyms:
+        return SynonymGroups.from_lines(csv.reader(synonyms, delimiter="\t"))
 
 def build_firstnames_variants() -> (NameVariants, PhoneticDict):
     synonyms = givennames_synonyms()
-    all_given_names = givennames_synonyms().keys()
     names_by_phonetics = PhoneticDict()
-    for name in all_given_names:
+    for name in synonyms:
         names_by_phonetics += name
-    return synonyms, names_by_phonetics
+    return synonyms, names_by_phonetics.freeze()
 
 def build_lastnames_phonetics() -> PhoneticDict:
     names_by_phonetics = PhoneticDict()
     for name in lastnames():
         names_by_phonetics += name.lower()
-    return names_by_phonetics
\ No newline at end of file
+    return names_by_phonetics.freeze()
\ No newline at end of file
@@ -0,0 +1,101 @@
+"""
+Nearest neighbour search over a vocabulary of names, for typo recovery.
+
+Names are embedded as hashed character n-gram counts (`^` and `$` marking the ends of the name),
+L2-normalized, and indexed in a faiss HNSW graph: the squared L2 distance between two names is
+`2 - 2 * cosine`, 0 for identical n-grams and 2 for names without any n-gram in common.
+Everything is computed offline, without a language model.
+"""
+import functools
+import hashlib
+import zlib
+from typing import Iterable
+
+import faiss
+import numpy as np
+
+NGRAM_SIZES = (2, 3)
+NGRAM_DIMENSION = 256
+HNSW_NEIGHBOURS = 32
+HNSW_EF_SEARCH = 32
+
+
+@functools.cache
+def ngram_bucket(ngram: str, dimension: int) -> int:
+    # crc32 is stable across processes, unlike `hash`
+    return zlib.crc32(ngram.encode("utf-8")) % dimension
+
+
+def ngram_vectors(names: Iterable[str], dimension: int = NGRAM_DIMENSION) -> np.ndarray:
+    """(n, dimension) float32 matrix of L2-normalized hashed n-gram counts."""
+    rows, columns = [], []
+    for i, name in enumerate(names):
+        padded = f"^{name}$"
+        for size in NGRAM_SIZES:
+            for start in range(len(padded) - size + 1):
+                rows.append(i)
+                columns.append(ngram_bucket(padded[start:start + size], dimension))
+    size = rows[-1] + 1 if rows else 0
+    counts = np.bincount(np.array(rows, dtype=np.int64) * dimension + columns, minlength=size * dimension)
+    vectors = counts.astype(np.float32).reshape(size, dimension)
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def vocabulary_sha256(names: Iterable[str]) -> str:
+    return hashlib.sha256("\n".join(names).encode("utf-8")).hexdigest()
+
+
+class NGramIndex:
+    """HNSW index of the n-gram vectors of `names`; search results are positions in `names`."""
+
+    def __init__(self, names: list[str], index: faiss.Index):
+        self.names = names
+        self.index = index
+        self.vocabulary: tuple[int, str] | None = (len(names), vocabulary_sha256(names))
+        self.index.hnsw.efSearch = HNSW_EF_SEARCH
+
+    @staticmethod
+    def build(names: Iterable[str], dimension: int = NGRAM_DIMENSION) -> 'NGramIndex':
+        names = list(names)
+        index = faiss.IndexHNSWFlat(dimension, HNSW_NEIGHBOURS)
+        index.add(ngram_vectors(names, dimension))
+        return NGramIndex(names, index)
+
+    @staticmethod
+    def load(path: str) -> 'NGramIndex':
+        with np.load(path) as arrays:
+            index = NGramIndex(arrays["names"].tolist(), faiss.deserialize_index(arrays["index"]))
+            # size and hash of the vocabulary the index was built from (absent in older files)
+            if "vocabulary_size" in arrays and "vocabulary_sha256" in arrays:
+                index.vocabulary = (int(arrays["vocabulary_size"]), str(arrays["vocabulary_sha256"]))
+            else:
+                index.vocabulary = None
+            return index
+
+    def save(self, path: str):
+        np.savez(
+            path,
+            names=np.array(self.names, dtype=str),
+            index=faiss.serialize_index(self.index),
+            vocabulary_size=np.array(len(self.names)),
+            vocabulary_sha256=np.array(vocabulary_sha256(self.names)),
+        )
+
+    def matches_vocabulary(self, names: list[str]) -> bool:
+        """Whether the index was built from exactly `names`, in this order (positions are indexes in it)."""
+        return self.vocabulary == (len(names), vocabulary_sha256(names))
+
+    def search(self, queries: list[str], k: int = 1) -> tuple[np.ndarray, np.ndarray]:
+        """Squared L2 distances and positions of the `k` nearest names of every query, as (n, k) arrays."""
+        if not queries:
+            return np.empty((0, k), dtype=np.float32), np.empty((0, k), dtype=np.int64)
+        return self.index.search(ngram_vectors(queries, self.index.d), k)
+
+    def nearest(self, queries: list[str], max_distance: float) -> list[str | None]:
+        """Nearest name of every query, None when it is `max_distance` away or more."""
+        distances, indices = self.search(queries, 1)
+        return [
+            self.names[idx] if idx >= 0 and distance < max_distance else None
+            for distance, idx in zip(distances[:, 0].tolist(), indices[:, 0].tolist())
+        ]
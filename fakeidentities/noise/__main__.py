@@ -1,13 +1,22 @@
+import argparse
 import dataclasses
+import os
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 import pandas as pd
 
-from fakeidentities.data import load_golden_records
+from fakeidentities.data import load_golden_table
 from fakeidentities.names import build_firstnames_variants, build_lastnames_phonetics
+from fakeidentities.noise.first_name_model import FirstNameModel
 from fakeidentities.noise.person import PersonNoiser
 from fakeidentities.person import Person
-from fakeidentities.utils import out_data_file
+from fakeidentities.person_table import PersonTable
+from fakeidentities.utils import bounded_map, out_data_file
+
+FIRST_NAME_MODEL_FILE = out_data_file("first_name_model.npz")
+# built once per worker process by `init_worker`
+noiser: PersonNoiser | None = None
 
 
 def print_compared(original: Person, noised: Person):
@@ -19,24 +28,66 @@ def print_compared(original: Person, noised: Person):
         print(f"{field_name}: {original_value} -> {noised_value}")
 
 
-if __name__ == '__main__':
-    mean = 10
-    std_dev = 5
-    persons = load_golden_records()
+def compile_firstname_model(persons: PersonTable, path: str):
+    """Compiles the first name model once, for the first and middle names of `persons` too, and saves it to `path`."""
+    variants, phonetics = build_firstnames_variants()
+    names = np.concatenate([persons.firstname, persons.middlename])
+    model = FirstNameModel.compile(variants, phonetics, names=(name for name in names if name))
+    model.save(path)
+
+
+def init_worker(firstname_model_path: str):
+    global noiser
     variants, phonetics = build_firstnames_variants()
     noiser = PersonNoiser(
         firstname_variants=variants,
         firstname_phonetics=phonetics,
-        lastname_phonetics=build_lastnames_phonetics()
+        lastname_phonetics=build_lastnames_phonetics(),
+        firstname_model=FirstNameModel.load(firstname_model_path),
     )
-    out_data = []
-    for p in persons:
-        num_duplicates = max(5, int(np.random.normal(loc=mean, scale=std_dev)))
-        for _ in range(num_duplicates):
-            noised = noiser.noise(p)
-            noised = noised.__dict__
-            noised['original_id'] = p.unique_id
-            out_data.append(noised)
-
-    df = pd.DataFrame(out_data)
-    df.to_csv(out_data_file("noisy_persons.csv"))
\ No newline at end of file
+
+
+def noise_chunk(persons: PersonTable, num_duplicates: np.ndarray) -> pd.DataFrame:
+    return noiser.noise_many(persons, num_duplicates).to_pandas()
+
+
+def noise_golden_records(out_path: str, workers: int | None = None, chunk_size: int = 10_000, mean: float = 10, std_dev: float = 5):
+    """
+    Noises golden records in chunks of `chunk_size` records, spread over `workers` processes
+    (in-process when `workers` is 1), and appends them to `out_path` in golden record order.
+    """
+    persons = load_golden_table()
+    compile_firstname_model(persons, FIRST_NAME_MODEL_FILE)
+    num_duplicates = np.maximum(5, np.random.normal(loc=mean, scale=std_dev, size=len(persons)).astype(int))
+    starts = range(0, len(persons), chunk_size)
+    chunks = (persons[start:start + chunk_size] for start in starts)
+    chunk_duplicates = (num_duplicates[start:start + chunk_size] for start in starts)
+    if workers == 1:
+        init_worker(FIRST_NAME_MODEL_FILE)
+        noised_chunks = map(noise_chunk, chunks, chunk_duplicates)
+        write_chunks(noised_chunks, out_path)
+    else:
+        workers = workers or os.cpu_count()
+        with ProcessPoolExecutor(workers, initializer=init_worker, initargs=(FIRST_NAME_MODEL_FILE,)) as executor:
+            # results come back in submission order, whichever worker finishes first; at most
+            # 2 chunks per worker are pending, so memory does not grow with the number of chunks
+            write_chunks(bounded_map(executor, noise_chunk, chunks, chunk_duplicates, max_pending=2 * workers), out_path)
+
+
+def write_chunks(chunks, out_path: str):
+    offset = 0
+    for df in chunks:
+        # a single running index, as if the chunks were one frame
+        df.index += offset
+        df.to_csv(out_path, mode="a" if offset else "w", header=not offset)
+        offset += len(df)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generates noisy duplicates of the golden records")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU, 1 to run in-process)")
+    parser.add_argument("--chunk-size", type=int, default=10_000, help="golden records per task")
+    parser.add_argument("--mean", type=float, default=10, help="average number of duplicates per golden record")
+    parser.add_argument("--std-dev", type=float, default=5)
+    args = parser.parse_args()
+    noise_golden_records(out_data_file("noisy_persons.csv"), args.workers, args.chunk_size, args.mean, args.std_dev)
@@ -1,9 +1,9 @@
 import dataclasses
 import random
-import nlpaug.augmenter.char as nac
 
+from fakeidentities.noise.keyboard import KeyboardTypos
 from fakeidentities.noise.noiser import Noiser, abbrv_or_full, typo_in_short_number
-from fakeidentities.parse.address_parser import parse_address, VALID_STREET_SUFFIXES, VALID_STREET_SUFFIXES_REVERSED, \
+from fakeidentities.parse.address_parser import parse_address_cached, ParsedUSAddress, VALID_STREET_SUFFIXES, VALID_STREET_SUFFIXES_REVERSED, \
     DIRECTIONAL_TERMS, DIRECTIONAL_TERMS_REVERSED, OCCUPANCY_TYPES, OCCUPANCY_TYPES_REVERSED
 
 
@@ -11,7 +11,7 @@ from fakeidentities.parse.address_parser import parse_address, VALID_STREET_SUFF
 class AddressNoiser(Noiser[str]):
     # TODO: config probabilities
     # Augmenter for typos
-    _keyboard_aug = nac.KeyboardAug(
+    _keyboard_aug = KeyboardTypos(
         aug_char_p=0.15,            # Probability of a character being augmented
         include_upper_case=False,   # Avoid altering upper-case letters
         aug_char_min=1,             # Minimum number of characters to augment
@@ -20,11 +20,13 @@ class AddressNoiser(Noiser[str]):
     )
 
     def augment(self, original: str) -> str:
-        return self._keyboard_aug.augment(original)[0]
+        return self._keyboard_aug.augment(original)
 
     def noise(self, original: str) -> str:
-        # 1. Parse address
-        parsed = parse_address(original)
+        # 1. Parse address (once per distinct address)
+        return self.noise_parsed(parse_address_cached(original))
+
+    def noise_parsed(self, parsed: ParsedUSAddress) -> str:
         max_missing = 2
         total_missing = 0
         # 2. Noise components individually based on probs
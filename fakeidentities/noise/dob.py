@@ -2,6 +2,8 @@ import dataclasses
 import datetime
 import random
 
+import numpy as np
+
 from fakeidentities.noise.noiser import Noiser
 
 @dataclasses.dataclass
@@ -10,7 +12,9 @@ class DateOfBirthNoiser(Noiser[datetime.date]):
     p_swap_days: float = 0.1
     p_off_year: float = 0.1
 
-    def noise(self, original: datetime.date) -> datetime.date:
+    def noise(self, original: datetime.date | None) -> datetime.date | None:
+        if original is None:
+            return None
         day = original.day
         month = original.month
         year = original.year
@@ -27,10 +31,51 @@ class DateOfBirthNoiser(Noiser[datetime.date]):
                     return datetime.date(day=day + 1, month=month, year=year)
                 else:
                     return datetime.date(day=day + 1, month=month, year=year)
+            else: # 27-29: no safe change
+                return original
         elif choice < self.p_swap_month_date + self.p_swap_days + self.p_off_year:
             if random.random() <= 0.5:
-                return datetime.date(day=day, month=month, year=year + 1)
+                year += 1
             else:
-                return datetime.date(day=day, month=month, year=year - 1)
+                year -= 1
+            if month == 2 and day == 29 and not is_leap_year(year):
+                day = 28
+            return datetime.date(day=day, month=month, year=year)
         else:
-            return datetime.date(day=day, month=month, year=year)
\ No newline at end of file
+            return datetime.date(day=day, month=month, year=year)
+
+    def noise_many(self, originals: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """
+        Batch counterpart of `noise` on a datetime64[D] array (NaT is kept as is): dates are split into
+        year/month/day int arrays, the same decisions are applied as masks, and the result is reassembled.
+        """
+        originals = np.asarray(originals, dtype="datetime64[D]")
+        years_since_epoch = originals.astype("datetime64[Y]")
+        months_since_epoch = originals.astype("datetime64[M]")
+        year = years_since_epoch.astype(np.int64) + 1970
+        month = (months_since_epoch - years_since_epoch.astype("datetime64[M]")).astype(np.int64) + 1
+        day = (originals - months_since_epoch.astype("datetime64[D]")).astype(np.int64) + 1
+        choice, coin = rng.random((2, len(originals)))
+
+        swap_month_date = (choice < self.p_swap_month_date) & (day <= 12)
+        day_change = ~swap_month_date & (choice < self.p_swap_month_date + self.p_swap_days)
+        off_year = ~swap_month_date & ~day_change & (choice < self.p_swap_month_date + self.p_swap_days + self.p_off_year)
+
+        new_day = np.where(swap_month_date, month, day)
+        month = np.where(swap_month_date, day, month)
+        day = new_day
+        # swap the day digits when the result is a valid day, else move to the next day if safe
+        swap_digits = day_change & (day % 10 <= 2)
+        next_day = day_change & ~swap_digits & (day > 2) & (day < 27)
+        day = np.where(swap_digits, day % 10 * 10 + day // 10, day + next_day)
+        year = year + np.where(off_year, np.where(coin <= 0.5, 1, -1), 0)
+        day[(month == 2) & (day == 29) & ~is_leap_year(year)] = 28
+
+        months = ((year - 1970) * 12 + month - 1).astype("datetime64[M]")
+        result = months.astype("datetime64[D]") + (day - 1)
+        result[np.isnat(originals)] = np.datetime64("NaT", "D")
+        return result
+
+
+def is_leap_year(year):
+    return (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
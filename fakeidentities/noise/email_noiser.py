@@ -1,30 +1,66 @@
-import copy
 import random
 
+import numpy as np
+
+from fakeidentities.noise.keyboard import KeyboardTypos
 from fakeidentities.noise.noiser import Noiser
-import nlpaug.augmenter.char as nac
 
 COMMON_EXTENSIONS = [ "com", "net", "org", "co" ]
 EMAIL_SEP = ['.', '-', '_']
+EXTENSIONS = np.array(COMMON_EXTENSIONS, dtype=object)
 
 def random_extension() -> str:
     return random.choice(COMMON_EXTENSIONS)
 
 
-def wrong_separator(original: str) -> str:
+def separator_alternatives(original: str) -> tuple[str, ...]:
+    """Every possible result of `wrong_separator(original)`, empty when it is left unchanged."""
     for sep in EMAIL_SEP:
         if sep not in original:
             continue
         idx = original.index(sep)
-        alternates = copy.copy(EMAIL_SEP)
         if idx > 0:
-            alternates.remove(sep)
-            new_sep = random.choice(alternates)
-            return original[:idx] + new_sep + original[idx+1:]
-    return original
+            return tuple(original[:idx] + new_sep + original[idx+1:] for new_sep in EMAIL_SEP if new_sep != sep)
+    return ()
+
+
+def wrong_separator(original: str) -> str:
+    alternatives = separator_alternatives(original)
+    return random.choice(alternatives) if alternatives else original
+
+
+def split_email(email: str) -> tuple[str, str, str | None]:
+    """
+    Local part (up to the last "@"), domain name and extension (after the last dot, None when the domain
+    has no dot) of an email.
+    """
+    name, _, domain = email.rpartition('@')
+    last_dot = domain.rfind('.')
+    if last_dot < 0:
+        return name, domain, None
+    return name, domain[:last_dot], domain[last_dot+1:]
+
+
+def join_email(name: str, tld: str, ext: str | None) -> str:
+    return name + '@' + tld if ext is None else name + '@' + tld + '.' + ext
+
+
+def alternatives_table(values) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (n, 2) array of the `separator_alternatives` of each value (None where there are none),
+    and whether each value has alternatives.
+    """
+    table = np.full((len(values), len(EMAIL_SEP) - 1), None, dtype=object)
+    has_alternatives = np.zeros(len(values), dtype=bool)
+    for i, value in enumerate(values):
+        alternatives = separator_alternatives(value)
+        if alternatives:
+            table[i] = alternatives
+            has_alternatives[i] = True
+    return table, has_alternatives
 
 class EmailNoiser(Noiser[str]):
-    _keyboard_aug = nac.KeyboardAug(
+    _keyboard_aug = KeyboardTypos(
         aug_char_p=0.15,            # Probability of a character being augmented
         include_upper_case=False,   # Avoid altering upper-case letters
         aug_char_min=1,             # Minimum number of characters to augment
@@ -35,24 +71,21 @@ class EmailNoiser(Noiser[str]):
     )
 
     def noise(self, original: str) -> str:
-        split = original.split('@')
-        name = split[0]
-        domain = split[1]
-        last_dot = domain.rfind('.')
-        tld = domain[:last_dot]
-        ext = domain[last_dot+1:]
+        if '@' not in original:
+            # not an email: nothing to split
+            return original
+        name, tld, ext = split_email(original)
         # Common typos in emails:
         # 1. Use one diacritic for another (before @) (eg: some-one@gmail.com for some_one@gmail.com)
         # 2. Use the wrong country code in domain name (eg: gmail.fr instead of gmail.com)
         name_typo = random.random()
         if name_typo < 0.05: # small chance that a "big" typo happens (OCR)
-            name = self._keyboard_aug.augment(name)[0] # TODO: this only augments chars before separator (dot)
-            name = name.replace(' ', '')
+            name = self._keyboard_aug.augment(name)
         elif name_typo < 0.15:
             name = wrong_separator(name)
 
         ext_typo = random.random()
-        if ext_typo < 0.15:
+        if ext_typo < 0.15 and ext is not None:
             ext = random_extension()
 
         tld_typo = random.random()
@@ -60,4 +93,43 @@ class EmailNoiser(Noiser[str]):
             if tld_typo < 0.1:
                 tld = wrong_separator(tld)
 
-        return name + '@' + tld + '.' + ext
+        return join_email(name, tld, ext)
+
+    def noise_many(self, originals: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """
+        Batch counterpart of `noise`: each distinct email is split once into local part, domain name and
+        extension, domains are interned, and the typos are applied as masks over the whole batch.
+        Only keyboard typos (5% of the local parts) run per value. Values without "@" are kept as they are.
+        """
+        size = len(originals)
+        if not size:
+            return np.empty(0, dtype=object)
+        email_ids: dict[str, int] = {}
+        rows = np.array([email_ids.setdefault(email, len(email_ids)) for email in originals.tolist()], dtype=np.int64)
+        names, tlds, exts = (np.array(column, dtype=object) for column in zip(*map(split_email, email_ids)))
+        is_email = np.array(['@' in email for email in email_ids], dtype=bool)
+        has_extension = np.array([ext is not None for ext in exts.tolist()], dtype=bool)
+        domain_ids: dict[str, int] = {}
+        email_domains = np.array([domain_ids.setdefault(tld, len(domain_ids)) for tld in tlds.tolist()], dtype=np.int64)
+        name_alternatives, name_has_alternatives = alternatives_table(names.tolist())
+        domain_alternatives, domain_has_alternatives = alternatives_table(list(domain_ids))
+        domains = np.array(list(domain_ids), dtype=object)
+        name_u, name_pick_u, ext_u, ext_pick_u, tld_u, tld_pick_u = rng.random((6, size))
+
+        name = names[rows]
+        keyboard_typo = name_u < 0.05
+        name[keyboard_typo] = self._keyboard_aug.augment_many(name[keyboard_typo].tolist())
+        swap = ~keyboard_typo & (name_u < 0.15) & name_has_alternatives[rows]
+        name[swap] = name_alternatives[rows[swap], (name_pick_u[swap] * name_alternatives.shape[1]).astype(np.int64)]
+
+        ext = np.where((ext_u < 0.15) & has_extension[rows], EXTENSIONS[(ext_pick_u * len(EXTENSIONS)).astype(np.int64)], exts[rows])
+
+        domain = email_domains[rows]
+        tld = domains[domain]
+        swap = (tld_u < 0.1) & domain_has_alternatives[domain]
+        tld[swap] = domain_alternatives[domain[swap], (tld_pick_u[swap] * domain_alternatives.shape[1]).astype(np.int64)]
+
+        emails = np.array([
+            join_email(name, tld, ext) for name, tld, ext in zip(name.tolist(), tld.tolist(), ext.tolist())
+        ], dtype=object)
+        return np.where(is_email[rows], emails, originals)
@@ -0,0 +1,92 @@
+import random
+from typing import Iterable
+
+import numpy as np
+from nicknames import NickNamer, default_lookup
+
+from fakeidentities.names import NameVariants
+from fakeidentities.phonetics import PhoneticDict
+
+NICKNAMES = "nicknames"
+CANONICALS = "canonicals"
+VARIANTS = "variants"
+PHONETICS = "phonetics"
+CANDIDATE_KINDS = (NICKNAMES, CANONICALS, VARIANTS, PHONETICS)
+
+
+class FirstNameModel:
+    """
+    Replacement candidates of every first name of a vocabulary, compiled once: nicknames, canonical names,
+    synonym variants and phonetic neighbours, as interned name indexes in CSR arrays.
+    Row i holds the candidates of `names[i]` (lowercase); candidates of a kind for row i are
+    `names[indices[indptr[i]:indptr[i + 1]]]`, so sampling one is a single array index.
+    """
+
+    def __init__(self, names: list[str], num_rows: int, candidates: dict[str, tuple[np.ndarray, np.ndarray]]):
+        # the first `num_rows` names have candidate rows, the others are only candidates
+        self.names = names
+        self.num_rows = num_rows
+        self.candidates = candidates
+        self.rows = {name: i for i, name in enumerate(names[:num_rows])}
+        # indexing lists is much cheaper than indexing arrays one scalar at a time
+        self._lists = {kind: (indptr.tolist(), indices.tolist()) for kind, (indptr, indices) in candidates.items()}
+
+    @staticmethod
+    def compile(variants: NameVariants, phonetics: PhoneticDict, names: Iterable[str] = (),
+                nickname_lookup: NameVariants | None = None) -> 'FirstNameModel':
+        """
+        Vocabulary: `names` (e.g. the first names of golden records), plus every name known to
+        `variants`, `phonetics` and the nickname table (`nicknames.default_lookup()` unless given:
+        canonical name -> nicknames).
+        """
+        if nickname_lookup is None:
+            nickname_lookup = default_lookup()
+        nicknamer = NickNamer(nickname_lookup=nickname_lookup)
+        vocabulary = list(dict.fromkeys([
+            *(name.lower() for name in names),
+            *variants, *phonetics,
+            *(canonical.lower().strip() for canonical in nickname_lookup),
+            *(nickname.lower().strip() for nicknames in nickname_lookup.values() for nickname in nicknames),
+        ]))
+        interned = {name: i for i, name in enumerate(vocabulary)}
+        lookups = {
+            NICKNAMES: nicknamer.nicknames_of,
+            CANONICALS: nicknamer.canonicals_of,
+            VARIANTS: lambda name: variants[name] if name in variants else (),
+            PHONETICS: phonetics.variants_of,
+        }
+        candidates = {}
+        for kind, lookup in lookups.items():
+            indptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+            indices = []
+            for i, name in enumerate(vocabulary):
+                indices.extend(interned.setdefault(candidate, len(interned)) for candidate in sorted(lookup(name)))
+                indptr[i + 1] = len(indices)
+            candidates[kind] = (indptr, np.array(indices, dtype=np.int32))
+        return FirstNameModel(list(interned), len(vocabulary), candidates)
+
+    @staticmethod
+    def load(path: str) -> 'FirstNameModel':
+        with np.load(path) as arrays:
+            candidates = {kind: (arrays[f"{kind}_indptr"], arrays[f"{kind}_indices"]) for kind in CANDIDATE_KINDS}
+            return FirstNameModel(arrays["names"].tolist(), int(arrays["num_rows"]), candidates)
+
+    def save(self, path: str):
+        arrays = {"names": np.array(self.names, dtype=str), "num_rows": np.array(self.num_rows)}
+        for kind, (indptr, indices) in self.candidates.items():
+            arrays[f"{kind}_indptr"] = indptr
+            arrays[f"{kind}_indices"] = indices
+        np.savez(path, **arrays)
+
+    def row(self, name: str) -> int | None:
+        """Row of a lowercase name, None when it is not in the vocabulary."""
+        return self.rows.get(name)
+
+    def sample(self, kind: str, row: int) -> str | None:
+        """A uniformly picked candidate of `kind` for `row`, None if it has none."""
+        indptr, indices = self._lists[kind]
+        start = indptr[row]
+        count = indptr[row + 1] - start
+        if not count:
+            return None
+        return self.names[indices[start + int(random.random() * count)]]
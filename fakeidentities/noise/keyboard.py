@@ -0,0 +1,176 @@
+"""
+Keyboard typos: characters are replaced by a neighbouring key on a QWERTY keyboard.
+
+Same model and knobs as `nlpaug.augmenter.char.KeyboardAug` (english layout, one key distance),
+with the adjacency table built once and separators of the original text kept as they are.
+"""
+import dataclasses
+import functools
+import math
+import random
+import re
+import string
+
+# one key distance on an english QWERTY keyboard (nlpaug's `en` keyboard model)
+QWERTY_NEIGHBOURS = {
+    "1": "!2@qw",
+    "2": "@1!3#qwe",
+    "3": "#2@4$we",
+    "4": "$3#5%er",
+    "5": "%4$6^rty",
+    "6": "^5%7&tyu",
+    "7": "&6^8*yui",
+    "8": "*7&9(uio",
+    "9": "(8*0)iop",
+    "!": "@q",
+    "@": "!#qw",
+    "#": "@$we",
+    "$": "#%er",
+    "%": "$",
+    "q": "1!2@was",
+    "w": "1!2@3#qeasd",
+    "e": "2@3#4$wrsdf",
+    "r": "3#4$5%etdfg",
+    "t": "4$5%6^ryfgh",
+    "y": "5%6^7&tughj",
+    "u": "6^7&8*tihjk",  # nlpaug's table has " t" (a space before t), here "t"
+    "i": "7&8*9(uojkl",
+    "o": "8*9(0)ipkl",
+    "p": "9(0)ol",
+    "a": "qwaszx",
+    "s": "qweadzxc",
+    "d": "wersfxcv",
+    "f": "ertdgcvb",
+    "g": "rtyfhvbn",
+    "h": "tyugjbnm",
+    "j": "yuihknm,<",
+    "k": "uiojlm,<.>",
+    "l": "iopk;:,<.>/?",
+    "z": "asx",
+    "x": "asdzc",
+    "c": "sdfxv",
+    "v": "dfgcb",
+    "b": "fghvn",
+    "n": "ghjbm",
+    "m": "hjkn,<",
+}
+
+# nlpaug tokens: runs of word characters, and every other non-blank character on its own
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+PLAN_CACHE_SIZE = 100_000
+ALNUM = set(string.ascii_lowercase + string.digits)
+
+
+def build_neighbours(include_special_char: bool, include_numeric: bool, include_upper_case: bool) -> dict[str, tuple[str, ...]]:
+    """Replacement candidates per character, filtered like nlpaug's `Keyboard` model."""
+    result: dict[str, set[str]] = {}
+    for key, values in QWERTY_NEIGHBOURS.items():
+        if not include_numeric and key.isdigit():
+            continue
+        if not include_special_char and key not in ALNUM:
+            continue
+        candidates = result.setdefault(key, set())
+        upper_candidates = result.setdefault(key.upper(), set())
+        for value in values:
+            if not include_numeric and value.isdigit():
+                continue
+            if not include_special_char and value not in ALNUM:
+                continue
+            candidates.add(value)
+            if include_upper_case:
+                candidates.add(value.upper())
+                upper_candidates.update((value, value.upper()))
+    return {
+        key: tuple(sorted(values - {key}))
+        for key, values in result.items()
+        if values - {key}
+    }
+
+
+def pick_distinct(values: tuple, count: int) -> list:
+    """Uniform sample of `count` distinct values; cheaper than `random.sample` for the few values drawn here."""
+    if count == 1:
+        return [values[int(random.random() * len(values))]]
+    picked = set()
+    while len(picked) < count:
+        picked.add(int(random.random() * len(values)))
+    return [values[i] for i in picked]
+
+
+@dataclasses.dataclass
+class KeyboardTypos:
+    """
+    Drop-in replacement for `nlpaug.augmenter.char.KeyboardAug(...).augment(text)[0]`:
+    `aug_word_p` of the words of at least `min_char` characters are picked, then `aug_char_p` of
+    their characters (between `aug_char_min` and `aug_char_max`) are replaced by a neighbouring key.
+    """
+    aug_char_p: float = 0.3
+    aug_char_min: int = 1
+    aug_char_max: int = 10
+    aug_word_p: float = 0.3
+    aug_word_min: int = 1
+    aug_word_max: int = 10
+    min_char: int = 4
+    include_special_char: bool = True
+    include_numeric: bool = True
+    include_upper_case: bool = True
+
+    def __post_init__(self):
+        self.neighbours = build_neighbours(self.include_special_char, self.include_numeric, self.include_upper_case)
+        # the same names, streets and towns are augmented over and over: their tokenization is memoized
+        self.text_plan = functools.lru_cache(PLAN_CACHE_SIZE)(self._text_plan)
+        self.word_plan = functools.lru_cache(PLAN_CACHE_SIZE)(self._word_plan)
+
+    @staticmethod
+    def _count(size: int, p: float, low: int, high: int) -> int:
+        return min(max(math.ceil(p * size), low), high)
+
+    def _word_plan(self, word: str) -> tuple[tuple[int, ...], int]:
+        """Positions of the characters that have neighbours, and how many of them to replace."""
+        positions = tuple(i for i, char in enumerate(word) if char in self.neighbours)
+        return positions, min(self._count(len(word), self.aug_char_p, self.aug_char_min, self.aug_char_max), len(positions))
+
+    def _text_plan(self, text: str) -> tuple[tuple[tuple[int, int], ...], int]:
+        """Spans of the words that can be augmented, and how many of them to augment."""
+        tokens = TOKEN_PATTERN.findall(text)
+        candidates = []
+        start = 0
+        for token in tokens:
+            start = text.index(token, start)
+            end = start + len(token)
+            if len(token) >= self.min_char and (self.include_special_char or token not in string.punctuation):
+                candidates.append((start, end))
+            start = end
+        return tuple(candidates), min(self._count(len(tokens), self.aug_word_p, self.aug_word_min, self.aug_word_max), len(candidates))
+
+    def _typo_word(self, word: str) -> str:
+        positions, count = self.word_plan(word)
+        if not count:
+            return word
+        neighbours = self.neighbours
+        chars = list(word)
+        for i in pick_distinct(positions, count):
+            candidates = neighbours[chars[i]]
+            chars[i] = candidates[int(random.random() * len(candidates))]
+        return "".join(chars)
+
+    def augment(self, text: str) -> str:
+        candidates, count = self.text_plan(text)
+        if not count:
+            return text
+        if len(candidates) == 1:
+            # a single word long enough (most names)
+            start, end = candidates[0]
+            return text[:start] + self._typo_word(text[start:end]) + text[end:]
+        parts = []
+        last = 0
+        for start, end in sorted(pick_distinct(candidates, count)):
+            parts.append(text[last:start])
+            parts.append(self._typo_word(text[start:end]))
+            last = end
+        parts.append(text[last:])
+        return "".join(parts)
+
+    def augment_many(self, texts) -> list[str]:
+        augment = self.augment
+        return [augment(text) for text in texts]
@@ -3,11 +3,12 @@ import re
 from abc import abstractmethod
 
 from fakeidentities.names import NameVariants, make_name
+from fakeidentities.noise.first_name_model import CANONICALS, NICKNAMES, PHONETICS, VARIANTS, FirstNameModel
+from fakeidentities.noise.keyboard import KeyboardTypos
 from fakeidentities.noise.noiser import Noiser
-from fakeidentities.phonetics import PhoneticDict, PHONETIC_MAP
+from fakeidentities.phonetics import PhoneticDict, PHONETIC_REWRITER
 from nicknames import NickNamer
 import random
-import nlpaug.augmenter.char as nac
 
 dup_chars = ["l", "n", "s", "t", "p", "e"]
 dup_letter_pattern = re.compile(r"(.)\1")
@@ -17,7 +18,7 @@ class AbstractNameNoiser(Noiser[str]):
     p_rem_duplicate_char: float = 0.2
     p_add_duplicate_char: float = 0.1
     p_random_augment: float = 0.35
-    _keyboard_aug = nac.KeyboardAug(
+    _keyboard_aug = KeyboardTypos(
         aug_char_p=0.15,            # Probability of a character being augmented
         include_upper_case=False,   # Avoid altering upper-case letters
         aug_char_min=1,             # Minimum number of characters to augment
@@ -32,12 +33,8 @@ class AbstractNameNoiser(Noiser[str]):
     def typo(self, name: str) -> str:
         # Only use augmenter as last resort, introduce some common mispellings before
         # Step 1: Apply the phonetic rules with probability (not guaranteed to be applied)
-        for phonetic, replacement in PHONETIC_MAP.items():
-            if random.random() < self.p_phonetic_replacement:  # 50% chance to apply this rule
-                new_name = name.replace(phonetic, replacement)
-                if new_name != name:
-                    name = new_name
-                    break
+        # each rule has a 50% chance to be tried, the first one changing the name is applied
+        name = PHONETIC_REWRITER.rewrite(name, self.p_phonetic_replacement)
         # Step 2: Handle doubled letters (simulate typo by removing one with 20% chance)
         choice = random.random()
         if dup_letter_pattern.match(name) and choice < self.p_rem_duplicate_char:  # 20% chance to remove a duplicate letter
@@ -52,7 +49,7 @@ class AbstractNameNoiser(Noiser[str]):
                     name = name.replace(char, char * 2, 1)
                     break
         elif choice < 0.35:  # 35% chance to insert a totally random typo
-            name = self._keyboard_aug.augment(name)[0]
+            name = self._keyboard_aug.augment(name)
 
         return name
 
@@ -66,9 +63,10 @@ class LastNameNoiser(AbstractNameNoiser):
         lookup = original.lower()
         choice = random.random()
         name = original
-        if lookup in self.phonetics and self.phonetics[lookup]:
+        phonetics = self.phonetics.variants_of(lookup)
+        if phonetics:
             if choice < self.p_phonetic:
-                name = random.choice(list(self.phonetics[lookup]))
+                name = random.choice(phonetics)
             elif choice < self.p_phonetic + self.p_typo:
                 name = self.typo(original)
         elif choice < self.p_typo:
@@ -90,9 +88,14 @@ class FirstNameNoiser(AbstractNameNoiser):
     p_variant: float = 0.15
     p_phonetic: float = 0.15
     p_typo: float = 0.15
+    # compiled candidates; names outside its vocabulary use the lookups above
+    model: FirstNameModel | None = None
 
     def noise(self, original: str) -> str:
         lookup = original.lower()
+        row = self.model.row(lookup) if self.model is not None else None
+        if row is not None:
+            return self.noise_compiled(original, row)
         # 1. Use nickname
         use_nickname = random.random()
         nicknames = self.nicknames.nicknames_of(original)
@@ -105,16 +108,40 @@ class FirstNameNoiser(AbstractNameNoiser):
         if use_initial < self.p_initial:
             return original[0].upper() + '.'
         choice = random.random()
+        phonetics = self.phonetics.variants_of(lookup)
         # TODO: refactor this in a better way
         # 2. Use common variant
         if lookup in self.variants and self.variants[lookup] and choice < self.p_phonetic:
             name = random.choice(list(self.variants[lookup]))
         # 3. Phonetic similarity name
-        elif lookup in self.phonetics and self.phonetics[lookup] and choice < self.p_variant + self.p_phonetic:
-            name = random.choice(list(self.phonetics[lookup]))
+        elif phonetics and choice < self.p_variant + self.p_phonetic:
+            name = random.choice(phonetics)
         # 4. Maybe Typo
         elif choice < self.p_typo:
             name = self.typo(original)
         else:
             name = original
         return make_name(name)
+
+    def noise_compiled(self, original: str, row: int) -> str:
+        """Same steps as `noise`, with candidates sampled from `model` row `row`."""
+        model = self.model
+        # 1. Use nickname
+        if random.random() < self.p_nickname:
+            nickname = model.sample(NICKNAMES, row) or model.sample(CANONICALS, row)
+            if nickname:
+                return make_name(nickname)
+        if random.random() < self.p_initial:
+            return original[0].upper() + '.'
+        choice = random.random()
+        name = None
+        # 2. Use common variant
+        if choice < self.p_phonetic:
+            name = model.sample(VARIANTS, row)
+        # 3. Phonetic similarity name
+        if name is None and choice < self.p_variant + self.p_phonetic:
+            name = model.sample(PHONETICS, row)
+        if name is None:
+            # 4. Maybe Typo
+            name = self.typo(original) if choice < self.p_typo else original
+        return make_name(name)
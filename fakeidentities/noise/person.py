@@ -1,15 +1,22 @@
 import dataclasses
 import random
 import uuid
+from typing import Iterable
 
+import numpy as np
+
+from fakeidentities.fast_providers import random_uuids
 from fakeidentities.names import NameVariants
 from fakeidentities.noise.address import AddressNoiser
 from fakeidentities.noise.dob import DateOfBirthNoiser
 from fakeidentities.noise.email_noiser import EmailNoiser
+from fakeidentities.noise.first_name_model import FirstNameModel
 from fakeidentities.noise.names import FirstNameNoiser, LastNameNoiser
 from fakeidentities.noise.noiser import Noiser
 from fakeidentities.noise.phone import PhoneNoiser
+from fakeidentities.parse.address_parser import ADDRESS_COLUMNS, parsed_from_columns
 from fakeidentities.person import Person, Sex
+from fakeidentities.person_table import MISSING_SEX, PersonTable
 from fakeidentities.phonetics import PhoneticDict
 
 @dataclasses.dataclass
@@ -25,17 +32,24 @@ class PersonNoiser(Noiser[Person]):
     p_missing_email: float = 0.2
     p_missing_sex: float = 0.3
     p_missing_phone: float = 0.2
+    rng: np.random.Generator = dataclasses.field(default_factory=np.random.default_rng)
+    # compiled from the variants and phonetics when not given
+    firstname_model: FirstNameModel | None = None
 
     def __post_init__(self):
+        if self.firstname_model is None:
+            self.firstname_model = FirstNameModel.compile(self.firstname_variants, self.firstname_phonetics)
         self.firstname_noiser = FirstNameNoiser(
             variants=self.firstname_variants,
-            phonetics=self.firstname_phonetics
+            phonetics=self.firstname_phonetics,
+            model=self.firstname_model,
         )
         self.middlename_noiser = FirstNameNoiser(
             variants=self.firstname_variants,
             phonetics=self.firstname_phonetics,
             p_initial=0.2,
             p_nickname=0.2,
+            model=self.firstname_model,
         )
         self.lastname_denoiser = LastNameNoiser(phonetics=self.lastname_phonetics)
         self.address_noiser = AddressNoiser()
@@ -53,9 +67,9 @@ class PersonNoiser(Noiser[Person]):
         if corporate_email and random.random() < self.p_missing_email:
             corporate_email = None
         if personal_email:
-            self.email_noiser.noise(personal_email)
+            personal_email = self.email_noiser.noise(personal_email)
         if corporate_email:
-            self.email_noiser.noise(corporate_email)
+            corporate_email = self.email_noiser.noise(corporate_email)
         dob = original.date_of_birth
         if random.random() < self.p_missing_dob:
             dob = None
@@ -87,3 +101,78 @@ class PersonNoiser(Noiser[Person]):
             personal_email=personal_email,
             corporate_email=corporate_email,
         )
+
+    def noise_many(self, originals: PersonTable | Iterable[Person], num_duplicates: int | np.ndarray) -> PersonTable:
+        """
+        Batch counterpart of `noise`: noises `num_duplicates[i]` copies of every row i of `originals`
+        (or `num_duplicates` copies of each when it is an int), with an `original_id` column linking each copy
+        back to its golden record. All field-level decisions are drawn as one matrix and missing-field masks
+        are applied column-wise, as are the date of birth, phone and email noisers; only the name and address
+        noisers run per value.
+        """
+        if not isinstance(originals, PersonTable):
+            originals = PersonTable.from_persons(originals)
+        source = np.repeat(np.arange(len(originals)), np.broadcast_to(num_duplicates, len(originals)))
+        duplicates = originals[source]
+        size = len(duplicates)
+        (
+            prefix_u, suffix_u, personal_email_u, corporate_email_u, dob_u,
+            sex_u, wrong_sex_u, wrong_sex_pick_u, phone_u, ssn_u,
+        ) = self.rng.random((10, size))
+
+        columns = {
+            "unique_id": np.array(random_uuids(size, self.rng), dtype=object),
+            "original_id": originals.unique_id[source],
+        }
+        # prefix and suffix are only kept with probability p_missing_*, as in `noise`
+        columns["prefix"] = np.where(duplicates.prefix.astype(bool) & (prefix_u < self.p_missing_prefix), duplicates.prefix, None)
+        columns["suffix"] = np.where(duplicates.suffix.astype(bool) & (suffix_u < self.p_missing_suffix), duplicates.suffix, None)
+        personal_email = np.where(personal_email_u < self.p_missing_email, None, duplicates.personal_email)
+        corporate_email = np.where(corporate_email_u < self.p_missing_email, None, duplicates.corporate_email)
+        columns["personal_email"] = self._noise_present_many(personal_email, self.email_noiser)
+        columns["corporate_email"] = self._noise_present_many(corporate_email, self.email_noiser)
+        # never change SSN, just set it to null sometimes
+        columns["social_security_number"] = np.where(ssn_u < self.p_missing_ssn, None, duplicates.social_security_number)
+
+        sex = np.where(sex_u < self.p_missing_sex, MISSING_SEX, duplicates.sex)
+        wrong_sex = (sex != MISSING_SEX) & (wrong_sex_u < 0.2) # p_wrong_sex
+        sex[wrong_sex] = np.where(wrong_sex_pick_u[wrong_sex] <= 0.5, Sex.MALE.value, Sex.FEMALE.value)
+        columns["sex"] = sex.astype(np.int8)
+
+        dob = np.where(dob_u < self.p_missing_dob, np.datetime64("NaT", "D"), duplicates.date_of_birth)
+        columns["date_of_birth"] = self.dob_noiser.noise_many(dob, self.rng)
+
+        phone = np.where(phone_u < self.p_missing_phone, None, duplicates.phone)
+        columns["phone"] = self._noise_present_many(phone, self.phone_noiser)
+        columns["firstname"] = self._noise_present(duplicates.firstname, self.firstname_noiser)
+        columns["middlename"] = self._noise_present(duplicates.middlename, self.middlename_noiser)
+        columns["lastname"] = self._noise_present(duplicates.lastname, self.lastname_denoiser)
+        columns["raw_address"] = self._noise_addresses(originals, source)
+        return PersonTable(columns)
+
+    def _noise_addresses(self, originals: PersonTable, source: np.ndarray) -> np.ndarray:
+        """
+        Addresses of golden records written with `parsed_addresses` are noised from their components,
+        otherwise they are parsed from `raw_address` (once per distinct address).
+        """
+        if not set(ADDRESS_COLUMNS.values()) <= originals.columns.keys():
+            return self._noise_present(originals.raw_address[source], self.address_noiser)
+        parsed = parsed_from_columns(originals.raw_address, originals.columns)
+        noise_parsed = self.address_noiser.noise_parsed
+        return np.array([
+            noise_parsed(parsed[i]) if parsed[i] is not None else None
+            for i in source.tolist()
+        ], dtype=object)
+
+    def _noise_present_many(self, values: np.ndarray, noiser: EmailNoiser | PhoneNoiser) -> np.ndarray:
+        result = values.copy()
+        present = values.astype(bool)
+        result[present] = noiser.noise_many(values[present], self.rng)
+        return result
+
+    @staticmethod
+    def _noise_present(values: np.ndarray, noiser: Noiser[str]) -> np.ndarray:
+        result = values.copy()
+        present = values.astype(bool)
+        result[present] = [noiser.noise(value) for value in values[present].tolist()]
+        return result
@@ -1,5 +1,8 @@
 import random
 
+import numpy as np
+
+from fakeidentities.fast_providers import to_strings
 from fakeidentities.noise.noiser import Noiser
 
 
@@ -9,9 +12,12 @@ class PhoneNoiser(Noiser[str]):
     def noise(self, original: str) -> str:
         # Find all digit indices
         digit_indices = [i for i, char in enumerate(original) if char.isdigit()]
+        if len(digit_indices) < 3:
+            # no digit with a neighbour on both sides
+            return original
         phone_chars = list(original)
         for _ in range(2): # Repeat a few times to swap potentially multiple chars
-            if random.random() < 0.2:  # 20% probability
+            if random.random() < self.p_swap:  # 20% probability
                 # Pick a random digit index (excluding first and last)
                 swap_idx = random.choice(digit_indices[1:-1])
                 # Get valid neighbors (previous or next digit indices in digit_indices)
@@ -25,3 +31,29 @@ class PhoneNoiser(Noiser[str]):
                 )
 
         return "".join(phone_chars)
+
+    def noise_many(self, originals: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """
+        Batch counterpart of `noise` for ASCII phone numbers: values are copied into a fixed-width
+        (n, width) byte buffer, and each swap iteration transposes one pair of neighbouring digits per row.
+        """
+        size = len(originals)
+        if not size:
+            return np.empty(0, dtype=object)
+        chars = np.array(originals.tolist(), dtype=bytes)
+        chars = chars.view(np.uint8).reshape(size, chars.itemsize).copy()
+        is_digit = (chars >= ord("0")) & (chars <= ord("9"))
+        num_digits = is_digit.sum(axis=1)
+        # columns of the digits of each row, in order
+        digit_columns = np.argsort(~is_digit, axis=1, kind="stable")
+        rows = np.arange(size)
+        for _ in range(2):
+            swap, pick, side = rng.random((3, size))
+            swap = np.flatnonzero((swap < self.p_swap) & (num_digits >= 3))
+            # a digit other than the first and last one, and one of its neighbours
+            position = 1 + (pick[swap] * (num_digits[swap] - 2)).astype(np.int64)
+            neighbour = position + np.where(side[swap] < 0.5, -1, 1)
+            left = digit_columns[rows[swap], position]
+            right = digit_columns[rows[swap], neighbour]
+            chars[swap, left], chars[swap, right] = chars[swap, right], chars[swap, left]
+        return to_strings(chars)
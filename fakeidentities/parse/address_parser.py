@@ -1,7 +1,12 @@
 import dataclasses
-from collections import defaultdict
+import functools
+import re
+from collections import Counter, defaultdict
+from typing import Iterable
 
+import numpy as np
 import usaddress
+from faker.providers.address.en_US import Provider as AddressProvider
 
 DIRECTIONAL_TERMS = {
     "n": "north",
@@ -63,6 +68,29 @@ OCCUPANCY_TYPES = {
 
 OCCUPANCY_TYPES_REVERSED = {v:k for k, v in OCCUPANCY_TYPES.items()}
 
+# number of distinct raw addresses kept by `parse_address_cached`
+PARSE_CACHE_SIZE = 100_000
+
+# Faker `en_US` address templates, on a single line
+STREET_ADDRESS_PATTERN = re.compile(
+    r"(?P<number>\d+) (?P<name>[A-Za-z]+) (?P<suffix>[A-Za-z]+)"
+    r"(?: (?P<occupancy_type>Apt\.|Suite) (?P<secondary_number>\d+))?"
+    r" (?P<city>[A-Za-z]+(?: [A-Za-z]+)?), (?P<state>[A-Z]{2}) (?P<postcode>\d{5})"
+)
+MILITARY_ADDRESS_PATTERN = re.compile(
+    r"(?P<head>PSC \d{4}, Box (?P<apo_box>\d{4})(?= APO)|Unit (?P<unit>\d{4}) Box (?P<dpo_box>\d{4})(?= DPO)|(?:USS|USNS|USNV|USCGC) [A-Za-z]+(?= FPO))"
+    r" (?P<kind>APO|DPO|FPO) (?P<state>A[AEP]) (?P<postcode>\d{5})"
+)
+FAKER_STREET_SUFFIXES = {suffix.lower() for suffix in AddressProvider.street_suffixes}
+# street names that usaddress may read as a direction or a street type
+AMBIGUOUS_STREET_NAMES = {
+    *DIRECTIONAL_TERMS, *DIRECTIONAL_TERMS.values(), *VALID_STREET_SUFFIXES, *VALID_STREET_SUFFIXES.values(),
+}
+# a city is either '{prefix} {first_name}[suffix]' or a single word
+FAKER_CITY_PREFIXES = {prefix.lower() for prefix in AddressProvider.city_prefixes}
+
+parse_counters: Counter[str] = Counter()
+
 
 def split_first_word_if_match(text: str, keywords: dict[str, str]) -> (str | None, str | None):
     if not text:
@@ -111,7 +139,111 @@ class ParsedUSAddress:
         res += sep + ' ' + self.state + ' ' + self.postcode
         return res
 
+# components of a parsed address, as columns of golden records
+ADDRESS_COLUMNS = {
+    field.name: f"address_{field.name}" for field in dataclasses.fields(ParsedUSAddress) if field.name != "raw"
+}
+
+
+def address_columns(parsed: ParsedUSAddress) -> dict[str, str | None]:
+    """Components of `parsed` keyed by their column name (empty components as None)."""
+    return {column: getattr(parsed, name) or None for name, column in ADDRESS_COLUMNS.items()}
+
+
+def parsed_from_columns(raw_addresses: np.ndarray, columns: dict[str, np.ndarray]) -> list[ParsedUSAddress | None]:
+    """Rebuilds the `ParsedUSAddress` of every row from address columns, without parsing (None when `raw` is missing)."""
+    components = [columns[column].tolist() for column in ADDRESS_COLUMNS.values()]
+    return [
+        ParsedUSAddress(raw, **dict(zip(ADDRESS_COLUMNS, values))) if raw else None
+        for raw, *values in zip(raw_addresses.tolist(), *components)
+    ]
+
+
 def parse_address(raw: str) -> ParsedUSAddress:
+    """
+    Parses the Faker `en_US` address templates directly (see `parse_faker_address`),
+    and only runs the usaddress CRF for addresses that do not match one of them.
+    Fast-path and fallback counts are kept in `parse_counters`.
+    """
+    parsed = parse_faker_address(raw)
+    if parsed is not None:
+        parse_counters["fast"] += 1
+        return parsed
+    parse_counters["fallback"] += 1
+    return parse_address_usaddress(raw)
+
+
+def parse_many(raws: Iterable[str]) -> list[ParsedUSAddress]:
+    """Parses each distinct address once."""
+    raws = list(raws)
+    parsed = {raw: parse_address(raw) for raw in dict.fromkeys(raws)}
+    return [parsed[raw] for raw in raws]
+
+
+def parse_faker_address(raw: str) -> ParsedUSAddress | None:
+    """
+    Deterministic parser for the single-line Faker `en_US` templates:
+    '{number} {name} {suffix}[ Apt./Suite ###] {city}, {state} {zip}', 'PSC ####, Box #### APO {state} {zip}',
+    'Unit #### Box #### DPO {state} {zip}' and '{USS|USNS|USNV|USCGC} {name} FPO {state} {zip}'.
+    Components are read from the template, with the conventions of `parse_address_usaddress`: the street suffix
+    stays in `street_name`, and a North/East/South/West city prefix is split into `post_directional`.
+    It intentionally differs from `parse_address_usaddress` where the usaddress CRF mislabels a template:
+    - '{name} {suffix} {prefix} {city}' streets: usaddress moves words across the street/city boundary
+      ('Stewart Forest Lake Karenhaven' gives street 'Stewart', town 'Forest Lake Karenhaven'),
+      and may tag a direction prefix as the street's post-directional, which `parse_address_usaddress` drops;
+    - 'PSC ####, Box ####': usaddress merges the PSC number into the box id ('PSC Box', '7500 5405'),
+      here the box is 'Box' / '5405' and the PSC number stays in `town`;
+    - '{ship} {name} FPO': usaddress may read the ship as a street ('USS' as house number) or miss the state,
+      here `town` is the ship and `fpo_apo` is 'FPO'.
+    Returns None for any address it is not sure about (street names that usaddress could read as a direction
+    or a street type, unknown street suffixes, multi-word cities without a Faker prefix, other layouts).
+    """
+    match = STREET_ADDRESS_PATTERN.fullmatch(raw)
+    if match:
+        name, suffix = match["name"], match["suffix"]
+        if suffix.lower() not in FAKER_STREET_SUFFIXES or name.lower() in AMBIGUOUS_STREET_NAMES:
+            return None
+        city = match["city"]
+        if " " in city and city.split(" ", 1)[0].lower() not in FAKER_CITY_PREFIXES:
+            return None
+        post_directional, town = split_first_word_if_match(city, DIRECTIONAL_TERMS)
+        return ParsedUSAddress(
+            raw=raw,
+            house_number=match["number"],
+            street_name=f"{name} {suffix}",
+            street_suffix=None,
+            post_directional=post_directional,
+            occupancy_type=match["occupancy_type"] or "",
+            secondary_number=match["secondary_number"] or "",
+            town=town,
+            postcode=match["postcode"],
+            state=match["state"],
+            po_box_type="",
+            po_box_id="",
+            fpo_apo=None,
+        )
+    match = MILITARY_ADDRESS_PATTERN.fullmatch(raw)
+    if match:
+        box = match["apo_box"] or match["dpo_box"]
+        return ParsedUSAddress(
+            raw=raw,
+            house_number="",
+            street_name="",
+            street_suffix=None,
+            post_directional=None,
+            occupancy_type="Unit" if match["unit"] else "",
+            secondary_number=match["unit"] or "",
+            town=match["head"],
+            postcode=match["postcode"],
+            state=match["state"],
+            po_box_type="Box" if box else "",
+            po_box_id=box or "",
+            fpo_apo=match["kind"],
+        )
+    return None
+
+
+def parse_address_usaddress(raw: str) -> ParsedUSAddress:
     # Parse using both libs
     usaddr = defaultdict(str)
     for k, v in usaddress.parse(raw):
@@ -147,4 +279,15 @@ def parse_address(raw: str) -> ParsedUSAddress:
         po_box_type=usaddr['USPSBoxType'],
         po_box_id=usaddr['USPSBoxID'],
         fpo_apo=fpo_apo
-    )
\ No newline at end of file
+    )
+
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_address_cached(raw: str) -> ParsedUSAddress:
+    """
+    `parse_address` behind a bounded LRU cache keyed by the raw address: every noisy duplicate of a golden
+    record (and co-resident family members) share the same address, so it is only parsed once.
+    `ParsedUSAddress` is frozen, so cached results can be shared safely.
+    Hit/miss counters are available through `parse_address_cached.cache_info()`.
+    """
+    return parse_address(raw)
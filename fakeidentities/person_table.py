@@ -0,0 +1,247 @@
+import dataclasses
+import datetime
+from collections.abc import MutableMapping
+from typing import Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from fakeidentities.person import Person, Sex
+
+PERSON_FIELDS = [field.name for field in dataclasses.fields(Person)]
+STRING_FIELDS = [name for name in PERSON_FIELDS if name not in ("date_of_birth", "sex")]
+# dictionary encoding of `sex`: the code is the enum value, 0 when missing
+MISSING_SEX = 0
+SEX_BY_CODE = {sex.value: sex for sex in Sex}
+SEX_BY_LABEL = {**{str(sex): sex.value for sex in Sex}, **{sex.name: sex.value for sex in Sex}}
+# labels of codes 1..n, as written in the golden records
+SEX_LABELS = [str(SEX_BY_CODE[code]) for code in sorted(SEX_BY_CODE)]
+
+
+def encode_sex(values: Iterable) -> np.ndarray:
+    """Encodes `Sex` members or their labels ("Sex.MALE", "MALE") to int8 codes."""
+    return np.array([
+        value.value if isinstance(value, Sex) else SEX_BY_LABEL.get(value, MISSING_SEX)
+        for value in values
+    ], dtype=np.int8)
+
+
+def years_between(dates: np.ndarray, today: datetime.date) -> np.ndarray:
+    return today.year - dates.astype("datetime64[Y]").astype(int) - 1970
+
+
+Column = np.ndarray | pa.ChunkedArray
+
+
+def take(column: Column, key) -> Column:
+    """`column[key]` for a slice, boolean mask or index array; Arrow columns stay Arrow."""
+    if isinstance(column, np.ndarray):
+        return column[key]
+    if isinstance(key, slice):
+        start, stop, step = key.indices(len(column))
+        if step == 1:
+            return column.slice(start, max(stop - start, 0))
+        key = np.arange(start, stop, step)
+    key = np.asarray(key)
+    if key.dtype == bool:
+        return column.filter(pa.array(key))
+    key = key.astype(np.int64)
+    return column.take(pa.array(np.where(key < 0, key + len(column), key)))
+
+
+class Columns(MutableMapping[str, np.ndarray]):
+    """
+    Columns of a `PersonTable`, by name. String columns read from Arrow are kept as Arrow arrays, and only
+    turned into object arrays of strings (None for nulls) the first time they are accessed.
+    """
+
+    def __init__(self, columns: dict[str, Column]):
+        self._columns = dict(columns)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        column = self._columns[name]
+        if not isinstance(column, np.ndarray):
+            column = self._columns[name] = column.to_numpy(zero_copy_only=False)
+        return column
+
+    def __setitem__(self, name: str, column: Column):
+        self._columns[name] = column
+
+    def __delitem__(self, name: str):
+        del self._columns[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def raw(self, name: str) -> Column:
+        """The column as stored, without converting it."""
+        return self._columns[name]
+
+    def __getstate__(self) -> dict:
+        # a sliced Arrow array is pickled with its whole buffers: slices are copied first
+        return {
+            name: column.combine_chunks() if isinstance(column, pa.ChunkedArray) else column
+            for name, column in self._columns.items()
+        }
+
+    def __setstate__(self, state: dict):
+        self._columns = {
+            name: pa.chunked_array([column]) if isinstance(column, pa.Array) else column
+            for name, column in state.items()
+        }
+
+
+class PersonTable:
+    """
+    Columnar alternative to a list of `Person`: one NumPy array per field, with `sex` stored as
+    int8 codes and `date_of_birth` as datetime64[D] (NaT when missing).
+    Rows are only turned into `Person` objects when accessed.
+    Columns that are not `Person` fields (e.g. `original_id`) are carried along as extras.
+    String columns may also be Arrow arrays (see `from_arrow`): they are converted on first access.
+    """
+
+    def __init__(self, columns: dict[str, Column]):
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError(f"Columns have different lengths: {lengths}")
+        missing = set(PERSON_FIELDS) - columns.keys()
+        if missing:
+            raise ValueError(f"Missing columns: {missing}")
+        self.columns = Columns(columns)
+        self._age: np.ndarray | None = None
+
+    @staticmethod
+    def from_persons(persons: Iterable[Person], **extras: Iterable) -> 'PersonTable':
+        persons = list(persons)
+        columns = {
+            name: np.array([getattr(p, name) for p in persons], dtype=object)
+            for name in STRING_FIELDS
+        }
+        columns["sex"] = encode_sex(p.sex for p in persons)
+        columns["date_of_birth"] = np.array([p.date_of_birth for p in persons], dtype="datetime64[D]")
+        for name, values in extras.items():
+            columns[name] = np.asarray(list(values), dtype=object)
+        return PersonTable(columns)
+
+    @staticmethod
+    def from_pandas(df: pd.DataFrame) -> 'PersonTable':
+        columns = {}
+        for name in df.columns:
+            if name == "sex":
+                columns[name] = encode_sex(df[name])
+            elif name == "date_of_birth":
+                columns[name] = pd.to_datetime(df[name], format="ISO8601").to_numpy(dtype="datetime64[D]")
+            else:
+                column = df[name].astype(object)
+                columns[name] = column.where(column.notna(), None).to_numpy(dtype=object)
+        return PersonTable(columns)
+
+    @staticmethod
+    def from_arrow(table: pa.Table | pa.RecordBatch) -> 'PersonTable':
+        """
+        Inverse of `to_arrow`, vectorized: `sex` labels ("Sex.MALE", "MALE", or a dictionary of them) are looked up
+        as a whole column, `date_of_birth` is cast to date32 (from ISO strings or timestamps) and the other columns
+        are kept as Arrow string arrays, until they are accessed.
+        """
+        columns = {}
+        for name, column in zip(table.column_names, table.columns):
+            if name == "sex":
+                positions = pc.index_in(column.cast(pa.string()), value_set=pa.array(list(SEX_BY_LABEL)))
+                # null and unknown labels take the last code: missing
+                codes = np.array([*SEX_BY_LABEL.values(), MISSING_SEX], dtype=np.int8)
+                columns[name] = codes[positions.fill_null(-1).to_numpy(zero_copy_only=False)]
+            elif name == "date_of_birth":
+                dates = column.cast(pa.date32()).to_numpy(zero_copy_only=False)
+                columns[name] = dates.astype("datetime64[D]")
+            else:
+                if isinstance(column, pa.Array):
+                    column = pa.chunked_array([column])
+                if column.type != pa.string():
+                    column = column.cast(pa.string())
+                columns[name] = column
+        return PersonTable(columns)
+
+    @staticmethod
+    def concat(tables: Iterable['PersonTable']) -> 'PersonTable':
+        tables = list(tables)
+        return PersonTable({
+            name: np.concatenate([table.columns[name] for table in tables])
+            for name in tables[0].columns
+        })
+
+    def __len__(self) -> int:
+        return len(self.columns.raw("unique_id"))
+
+    def __getitem__(self, key):
+        """An int returns a `Person`, a slice, mask or index array returns a `PersonTable`."""
+        if isinstance(key, (int, np.integer)):
+            return self.row(int(key))
+        table = PersonTable({name: take(self.columns.raw(name), key) for name in self.columns})
+        if self._age is not None:
+            table._age = self._age[key]
+        return table
+
+    def __iter__(self) -> Iterator[Person]:
+        for i in range(len(self)):
+            yield self.row(i)
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        columns = self.__dict__.get("columns", {})
+        if name in columns:
+            return columns[name]
+        raise AttributeError(name)
+
+    def row(self, i: int) -> Person:
+        values = {name: self.columns[name][i] for name in STRING_FIELDS}
+        dob = self.columns["date_of_birth"][i]
+        return Person(
+            **values,
+            date_of_birth=None if np.isnat(dob) else dob.item(),
+            sex=SEX_BY_CODE.get(int(self.columns["sex"][i])),
+        )
+
+    @property
+    def extra_columns(self) -> list[str]:
+        return [name for name in self.columns if name not in PERSON_FIELDS]
+
+    def to_persons(self) -> list[Person]:
+        return list(self)
+
+    @property
+    def age(self) -> np.ndarray:
+        """Age in years (same rule as `Person.age`), computed once for the whole table."""
+        if self._age is None:
+            self._age = years_between(self.columns["date_of_birth"], datetime.date.today())
+        return self._age
+
+    def sex_labels(self) -> np.ndarray:
+        return np.array([None] + SEX_LABELS, dtype=object)[self.columns["sex"]]
+
+    def to_pandas(self) -> pd.DataFrame:
+        """Same layout as a DataFrame of `Person`: `sex` as "Sex.MALE" labels, then extra columns."""
+        df = pd.DataFrame({name: self.columns[name] for name in PERSON_FIELDS})
+        df["sex"] = self.sex_labels()
+        for name in self.extra_columns:
+            df[name] = self.columns[name]
+        return df
+
+    def to_arrow(self) -> pa.Table:
+        arrays = {}
+        for name in self.columns:
+            column = self.columns.raw(name)
+            if isinstance(column, pa.ChunkedArray):
+                arrays[name] = column
+            elif name == "sex":
+                # dictionary indices are the enum values shifted to start at 0
+                indices = pa.array(column - 1, mask=column == MISSING_SEX)
+                arrays[name] = pa.DictionaryArray.from_arrays(indices, pa.array(SEX_LABELS))
+            elif name == "date_of_birth":
+                arrays[name] = pa.array(column, type=pa.date32())
+            else:
+                arrays[name] = pa.array(column, type=pa.string())
+        return pa.table(arrays)
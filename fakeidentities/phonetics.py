@@ -1,23 +1,38 @@
+import functools
+import math
+import random
 from collections import defaultdict, Counter
+from typing import Iterable, Iterator
 
 from fuzzy import DMetaphone
 from jellyfish import soundex, nysiis
 from unidecode import unidecode
 
 
+# rules applicable to the most frequent names
+REWRITE_CACHE_SIZE = 100_000
+# (double metaphone encodings, nysiis, soundex) of a name
+PhoneticKey = tuple[tuple[bytes, ...], str, str]
+
+
 class PhoneticDict:
     """
     Dictionary holding double metaphone encodings for a set of names.
+    Once all names are added, `freeze()` precomputes the variants of every name so lookups are a dict access.
     """
     _metaphone_dict: defaultdict[bytes, set[str]]
     _soundex_dict: defaultdict[str, set[str]]
     _nysiis_dict: defaultdict[str, set[str]]
+    _keys: dict[str, PhoneticKey]
+    _variants: dict[str, tuple[str, ...]] | None
     _metaphone = DMetaphone(4)
 
     def __init__(self):
         self._metaphone_dict = defaultdict(set)
         self._soundex_dict = defaultdict(set)
         self._nysiis_dict = defaultdict(set)
+        self._keys = {}
+        self._variants = None
 
     def __add__(self, name: str) -> 'PhoneticDict':
         """
@@ -25,13 +40,22 @@ class PhoneticDict:
         :param name: the name to add to all variants
         :return: the dict, so that the call is fluent
         """
-        for encoding in self._metaphone_encode(name):
+        metaphones, nysiis_code, soundex_code = self._keys[name] = self._encode(name)
+        for encoding in metaphones:
             self._metaphone_dict[encoding].add(name)
-        self._nysiis_dict[nysiis(name)].add(name)
-        self._soundex_dict[soundex(name)].add(name)
+        self._nysiis_dict[nysiis_code].add(name)
+        self._soundex_dict[soundex_code].add(name)
+        self._variants = None
         return self
 
+    def __iter__(self) -> Iterator[str]:
+        """Names added to the dict."""
+        return iter(self._keys)
+
     def __contains__(self, name: str) -> bool:
+        key = self._keys.get(name)
+        if key is not None:
+            return bool(key[0])
         for encoding in self._metaphone_encode(name):
             if encoding in self._metaphone_dict:
                 return True
@@ -45,6 +69,8 @@ class PhoneticDict:
         :param name: the name to look variants for
         :return: a set of variant names that are mostly pronounced the same (for 2 or more encoders)
         """
+        if self._variants is not None and name in self._variants:
+            return set(self._variants[name])
         counter = Counter()
         for encoding in self._metaphone_encode(name):
             counter.update(self._metaphone_dict.get(encoding, set()))
@@ -52,6 +78,54 @@ class PhoneticDict:
         counter.update(self._soundex_dict.get(soundex(name), set()))
         return set([k for (k, v) in counter.items() if v >= 2])
 
+    def variants_of(self, name: str) -> tuple[str, ...]:
+        """
+        Variants of `name` (as `self[name]`, sorted) if `name in self`, an empty tuple otherwise.
+        A single dict access for the names of a frozen dict.
+        """
+        if self._variants is not None and name in self._variants:
+            return self._variants[name] if self._keys[name][0] else ()
+        if name not in self:
+            return ()
+        return tuple(sorted(self[name]))
+
+    def freeze(self) -> 'PhoneticDict':
+        """
+        Precomputes the variants of every name added so far (see `build_variant_table`).
+        Adding a name afterwards drops the table.
+        """
+        self._variants = self.build_variant_table()
+        return self
+
+    def build_variant_table(self) -> dict[str, tuple[str, ...]]:
+        """
+        Variants of every name of the dict, computed once per distinct phonetic key.
+        A name is a variant when at least 2 encodings match, with both double metaphone encodings counted
+        (as in `__getitem__`): that is the union of the pairwise intersections of the matching buckets.
+        """
+        variants_by_key: dict[PhoneticKey, tuple[str, ...]] = {}
+        table = {}
+        for name, key in self._keys.items():
+            variants = variants_by_key.get(key)
+            if variants is None:
+                variants = variants_by_key[key] = self._variants_of_key(key)
+            table[name] = variants
+        return table
+
+    def _variants_of_key(self, key: PhoneticKey) -> tuple[str, ...]:
+        metaphones, nysiis_code, soundex_code = key
+        buckets = [self._metaphone_dict[encoding] for encoding in metaphones]
+        buckets.append(self._nysiis_dict[nysiis_code])
+        buckets.append(self._soundex_dict[soundex_code])
+        variants = set()
+        for i, bucket in enumerate(buckets):
+            for other in buckets[i + 1:]:
+                variants |= bucket & other
+        return tuple(sorted(variants))
+
+    def _encode(self, name: str) -> PhoneticKey:
+        return tuple(self._metaphone_encode(name)), nysiis(name), soundex(name)
+
     def _metaphone_encode(self, name: str) -> list[bytes]:
         sanitized = unidecode(name)
         return [e for e in self._metaphone(sanitized) if e is not None]
@@ -92,4 +166,65 @@ PHONETIC_MAP = {
     "ou": "ow",  # ou -> ow (e.g., 'George' -> 'Gorge')
     "aw": "ao",  # aw -> ao (e.g., 'Lawrence' -> 'Laorence')
     "ow": "au",  # ow -> au (e.g., 'Howard' -> 'Haud')
-}
\ No newline at end of file
+}
+
+class PhoneticRewriter:
+    """
+    Applies one of a list of rewrite rules to a name, as `AbstractNameNoiser.typo` does with `PHONETIC_MAP`:
+    rules are tried in order, each one with probability `p`, and the first one that changes the name is applied.
+    Only rules that occur in the name can change it, so they are found first (rules are indexed by their first
+    character), then one of them is drawn with the same probabilities: the j-th applicable one with p * (1 - p)^j.
+    A rule anchored with "^" (or "$") only applies at the start (or end) of a name; other rules replace every occurrence.
+    """
+
+    def __init__(self, rules: dict[str, str]):
+        self.rules: list[tuple[str, str, bool, bool]] = []
+        self.by_first_char: defaultdict[str, list[int]] = defaultdict(list)
+        for pattern, replacement in rules.items():
+            at_start = pattern.startswith("^")
+            at_end = pattern.endswith("$")
+            pattern = pattern.removeprefix("^").removesuffix("$")
+            self.by_first_char[pattern[0]].append(len(self.rules))
+            self.rules.append((pattern, replacement, at_start, at_end))
+        self.applicable = functools.lru_cache(REWRITE_CACHE_SIZE)(self._applicable)
+
+    def _applicable(self, name: str) -> tuple[int, ...]:
+        """Indexes (in rule order) of the rules that would change `name`."""
+        found = []
+        for char in set(name):
+            for idx in self.by_first_char.get(char, ()):
+                pattern, replacement, at_start, at_end = self.rules[idx]
+                if at_start:
+                    applies = name.startswith(pattern)
+                elif at_end:
+                    applies = name.endswith(pattern)
+                else:
+                    applies = len(pattern) == 1 or pattern in name
+                if applies and pattern != replacement:
+                    found.append(idx)
+        return tuple(sorted(found))
+
+    def apply(self, name: str, idx: int) -> str:
+        pattern, replacement, at_start, at_end = self.rules[idx]
+        if at_start:
+            return replacement + name[len(pattern):]
+        if at_end:
+            return name[:len(name) - len(pattern)] + replacement
+        return name.replace(pattern, replacement)
+
+    def rewrite(self, name: str, p: float) -> str:
+        applicable = self.applicable(name)
+        if not applicable or p <= 0:
+            return name
+        # number of applicable rules skipped before the first one drawn: geometric, from a single draw
+        skipped = 0 if p >= 1 else int(math.log(1.0 - random.random()) / math.log(1.0 - p))
+        if skipped >= len(applicable):
+            return name
+        return self.apply(name, applicable[skipped])
+
+    def rewrite_many(self, names: Iterable[str], p: float) -> list[str]:
+        rewrite = self.rewrite
+        return [rewrite(name, p) for name in names]
+
+
+PHONETIC_REWRITER = PhoneticRewriter(PHONETIC_MAP)
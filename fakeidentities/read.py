@@ -1,8 +1,8 @@
 
-from fakeidentities.data import NAMES_ALTERNATIVES
+from fakeidentities import data
 
 if __name__ == '__main__':
-    df = NAMES_ALTERNATIVES
+    df = data.NAMES_ALTERNATIVES
     sum_by_name = df.groupby('name').sum().drop(columns='alternative_name').rename(columns={'occurrences': 'sum'})
     print(sum_by_name)
     alt_percent = df.merge(sum_by_name, on='name')
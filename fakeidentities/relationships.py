@@ -0,0 +1,109 @@
+from array import array
+from enum import IntEnum
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from fakeidentities.person import Person
+from fakeidentities.person_table import PersonTable
+
+
+class Relationship(IntEnum):
+    COUPLE = 0
+    PARENT = 1
+
+    @property
+    def label(self) -> str:
+        return self.name.lower()
+
+
+class RelationshipGraph:
+    """
+    Compact relationship store: persons are addressed by their int32 position in `persons`,
+    and edges are kept as typed arrays (src, dst, relationship), i.e. 9 bytes per edge.
+    A CSR adjacency is built on demand for neighbourhood queries.
+    """
+
+    def __init__(self):
+        self.persons: list[Person] = []
+        self._src = array('i')
+        self._dst = array('i')
+        self._kind = array('b')
+        self._csr: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None
+
+    def __len__(self) -> int:
+        return len(self.persons)
+
+    def add_person(self, person: Person) -> int:
+        self.persons.append(person)
+        return len(self.persons) - 1
+
+    def add_edge(self, src: int, dst: int, relationship: Relationship):
+        self._src.append(src)
+        self._dst.append(dst)
+        self._kind.append(relationship)
+        self._csr = None
+
+    def add_household(self, members: list[Person], relationships: Iterable[tuple[Person, Person, str]]):
+        # members are matched by identity, not by hashing all their fields
+        index = {id(member): self.add_person(member) for member in members}
+        for src, dst, relationship in relationships:
+            self.add_edge(index[id(src)], index[id(dst)], Relationship[relationship.upper()])
+
+    @property
+    def src(self) -> np.ndarray:
+        return np.frombuffer(self._src, dtype=np.int32)
+
+    @property
+    def dst(self) -> np.ndarray:
+        return np.frombuffer(self._dst, dtype=np.int32)
+
+    @property
+    def relationship(self) -> np.ndarray:
+        return np.frombuffer(self._kind, dtype=np.int8)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self._src)
+
+    def csr(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Undirected adjacency in CSR form: neighbours of node i are `indices[indptr[i]:indptr[i + 1]]`,
+        with the relationship of each edge in `relationships` at the same positions.
+        """
+        if self._csr is None:
+            rows = np.concatenate([self.src, self.dst])
+            cols = np.concatenate([self.dst, self.src])
+            kinds = np.concatenate([self.relationship, self.relationship])
+            order = np.argsort(rows, kind="stable")
+            indptr = np.zeros(len(self.persons) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(rows, minlength=len(self.persons)), out=indptr[1:])
+            self._csr = (indptr, cols[order], kinds[order])
+        return self._csr
+
+    def neighbours(self, node: int, relationship: Relationship | None = None) -> np.ndarray:
+        indptr, indices, kinds = self.csr()
+        neighbours = indices[indptr[node]:indptr[node + 1]]
+        if relationship is not None:
+            neighbours = neighbours[kinds[indptr[node]:indptr[node + 1]] == relationship]
+        return neighbours
+
+    def to_table(self) -> PersonTable:
+        return PersonTable.from_persons(self.persons)
+
+    def edges_frame(self) -> pd.DataFrame:
+        """Edges as unique ids, in the `golden_records_edges` format."""
+        ids = np.array([person.unique_id for person in self.persons], dtype=object)
+        return pd.DataFrame({"src": ids[self.src], "dst": ids[self.dst]})
+
+    def to_networkx(self):
+        """Converts to a networkx graph keyed by `Person`, as used for visualization. Meant for small graphs."""
+        import networkx as nx
+        graph = nx.Graph()
+        graph.add_nodes_from(self.persons)
+        graph.add_edges_from(
+            (self.persons[src], self.persons[dst], {"relationship": Relationship(kind).label})
+            for src, dst, kind in zip(self.src.tolist(), self.dst.tolist(), self.relationship.tolist())
+        )
+        return graph
@@ -1,8 +1,13 @@
 import os
 import unicodedata
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
 from pathlib import Path
+from typing import Callable, Iterable, Iterator
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 PROJECT_ROOT_PATH = Path(__file__).parent.parent
 DATA_RAW_PATH = os.path.join(PROJECT_ROOT_PATH, "data_raw")
@@ -27,4 +32,71 @@ def sanitize_string(input_string):
     # Normalize the string to NFKD form and remove diacritical marks
     normalized = unicodedata.normalize('NFKD', input_string)
     sanitized = ''.join(c for c in normalized if not unicodedata.combining(c))
-    return sanitized.lower()  # Convert to lowercase
\ No newline at end of file
+    return sanitized.lower()  # Convert to lowercase
+
+def bounded_map(executor: Executor, fn: Callable, *iterables: Iterable, max_pending: int) -> Iterator:
+    """
+    `executor.map` with at most `max_pending` tasks in flight: inputs are consumed, and results
+    yielded in submission order, as the oldest task completes.
+    """
+    pending: deque[Future] = deque()
+    for args in zip(*iterables):
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+        pending.append(executor.submit(fn, *args))
+    while pending:
+        yield pending.popleft().result()
+
+
+def bounded_map_unordered(executor: Executor, fn: Callable, *iterables: Iterable, max_pending: int) -> Iterator:
+    """Same as `bounded_map`, but results are yielded as soon as their task completes, in any order."""
+    pending: set[Future] = set()
+    for args in zip(*iterables):
+        if len(pending) >= max_pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            yield from (future.result() for future in done)
+        pending.add(executor.submit(fn, *args))
+    for future in wait(pending).done:
+        yield future.result()
+
+
+class ChunkedWriter:
+    """
+    Writes rows (dicts) to a CSV or Parquet file, depending on the extension of `path`,
+    buffering at most `chunk_rows` rows in memory.
+    """
+
+    def __init__(self, path: str, schema: pa.Schema, chunk_rows: int = 100_000):
+        self.path = path
+        self.schema = schema
+        self.chunk_rows = chunk_rows
+        self._rows: list[dict] = []
+        self._written = False
+        self._parquet_writer = pq.ParquetWriter(path, schema) if path.endswith(".parquet") else None
+
+    def write(self, row: dict):
+        self._rows.append(row)
+        if len(self._rows) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        if not self._rows and self._written:
+            return
+        chunk = pd.DataFrame(self._rows, columns=self.schema.names)
+        if self._parquet_writer:
+            self._parquet_writer.write_table(pa.Table.from_pandas(chunk, schema=self.schema, preserve_index=False))
+        else:
+            chunk.to_csv(self.path, mode="a" if self._written else "w", header=not self._written, index=False)
+        self._written = True
+        self._rows = []
+
+    def close(self):
+        self.flush()
+        if self._parquet_writer:
+            self._parquet_writer.close()
+
+    def __enter__(self) -> 'ChunkedWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
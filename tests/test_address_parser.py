@@ -0,0 +1,91 @@
+import dataclasses
+
+import numpy as np
+import pytest
+
+from fakeidentities.fast_providers import FastProviders
+from fakeidentities.parse.address_parser import (
+    ParsedUSAddress, parse_address, parse_address_usaddress, parse_counters, parse_faker_address,
+)
+
+STREET = dict(house_number="791", street_name="Crist Parks", street_suffix=None, post_directional=None,
+              occupancy_type="", secondary_number="", po_box_type="", po_box_id="", fpo_apo=None)
+MILITARY = dict(house_number="", street_name="", street_suffix=None, post_directional=None,
+                occupancy_type="", secondary_number="", po_box_type="", po_box_id="")
+
+
+def parsed(raw: str, **components) -> ParsedUSAddress:
+    return ParsedUSAddress(raw=raw, **components)
+
+
+FAST_PATH_CASES = [
+    # '{last_name}{city_suffix}' city
+    parsed("791 Crist Parks Sashabury, IL 86039", **STREET, town="Sashabury", state="IL", postcode="86039"),
+    # secondary addresses
+    parsed("791 Crist Parks Apt. 046 Sashabury, IL 86039",
+           **{**STREET, "occupancy_type": "Apt.", "secondary_number": "046"},
+           town="Sashabury", state="IL", postcode="86039"),
+    parsed("791 Crist Parks Suite 046 Sashabury, IL 86039",
+           **{**STREET, "occupancy_type": "Suite", "secondary_number": "046"},
+           town="Sashabury", state="IL", postcode="86039"),
+    # '{prefix} {first_name}{city_suffix}' and '{prefix} {first_name}' cities
+    parsed("791 Crist Parks Lake Emilyview, ND 00501", **STREET, town="Lake Emilyview", state="ND", postcode="00501"),
+    parsed("791 Crist Parks Port Aaron, ND 00501", **STREET, town="Port Aaron", state="ND", postcode="00501"),
+    # a direction prefix is the post-directional, as in `parse_address_usaddress`
+    parsed("791 Crist Parks West Timothyfurt, ND 00501", **{**STREET, "post_directional": "West"},
+           town="Timothyfurt", state="ND", postcode="00501"),
+    parsed("791 Crist Parks North Emily, ND 00501", **{**STREET, "post_directional": "North"},
+           town="Emily", state="ND", postcode="00501"),
+    # military addresses
+    parsed("PSC 7500, Box 5405 APO AE 67225", **{**MILITARY, "po_box_type": "Box", "po_box_id": "5405"},
+           town="PSC 7500, Box 5405", state="AE", postcode="67225", fpo_apo="APO"),
+    parsed("Unit 3333 Box 9342 DPO AA 01234",
+           **{**MILITARY, "occupancy_type": "Unit", "secondary_number": "3333", "po_box_type": "Box", "po_box_id": "9342"},
+           town="Unit 3333 Box 9342", state="AA", postcode="01234", fpo_apo="DPO"),
+    *[
+        parsed(f"{ship} Hill FPO AP 31096", **MILITARY, town=f"{ship} Hill", state="AP", postcode="31096", fpo_apo="FPO")
+        for ship in ("USS", "USNS", "USNV", "USCGC")
+    ],
+]
+
+
+@pytest.mark.parametrize("expected", FAST_PATH_CASES, ids=lambda expected: expected.raw)
+def test_fast_path(expected):
+    assert parse_faker_address(expected.raw) == expected
+
+
+FALLBACK_CASES = [
+    "12 North Street Sashabury, IL 86039",  # street name usaddress reads as a direction
+    "12 Avenue Parks Sashabury, IL 86039",  # street name usaddress reads as a street type
+    "12 Crist Wynd Sashabury, IL 86039",  # suffix Faker does not generate
+    "12 Crist Parks Sasha Bury, IL 86039",  # multi-word city without a Faker prefix
+    "12 Crist Parks, Sashabury, IL 86039",
+    "12 Crist Parks\nSashabury, IL 86039",
+    "12 Crist Parks Sashabury, IL 86039-1234",
+    "PO Box 123, Sashabury, IL 86039",
+    "PSC 7500, Box 5405 APO XX 67225",
+]
+
+
+@pytest.mark.parametrize("raw", FALLBACK_CASES)
+def test_fallback(raw):
+    assert parse_faker_address(raw) is None
+    fallbacks = parse_counters["fallback"]
+    assert parse_address(raw) == parse_address_usaddress(raw)
+    assert parse_counters["fallback"] == fallbacks + 1
+
+
+def test_fast_path_agrees_with_usaddress():
+    # templates the usaddress CRF labels correctly give the same components on both paths
+    for raw in ["791 Crist Parks Apt. 046 Sashabury, IL 86039", "Unit 3333 Box 9342 DPO AA 01234"]:
+        fast, slow = parse_faker_address(raw), parse_address_usaddress(raw)
+        assert dataclasses.asdict(fast) == dataclasses.asdict(slow)
+
+
+def test_generated_addresses():
+    raws = FastProviders(np.random.default_rng(0)).addresses(5_000).tolist()
+    parsed_raws = [parse_faker_address(raw) for raw in raws]
+    assert sum(parsed is None for parsed in parsed_raws) < len(raws) * 0.01
+    for raw, parsed in zip(raws, parsed_raws):
+        if parsed is not None and not parsed.fpo_apo:
+            assert parsed.to_line_str() == raw
@@ -0,0 +1,102 @@
+import csv
+import dataclasses
+import datetime
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pyarrow as pa
+import pytest
+
+from fakeidentities import data
+from fakeidentities.golden_records import Household, base_individuals_table, write_households
+from fakeidentities.person import Person, Sex
+from fakeidentities.person_table import SEX_BY_CODE, SEX_BY_LABEL
+
+
+def test_cache_entry(tmp_path):
+    source = tmp_path / "names.csv"
+    source.write_text("name\nanna\nbob\n")
+    cache_path = str(tmp_path / "cache" / "names.feather")
+    table = pa.table({"name": ["anna", "bob"]})
+    data.write_cached(table, cache_path, data.source_stamp(str(source)))
+    assert data.read_cached(str(source), cache_path)["name"].tolist() == ["anna", "bob"]
+    source.write_text("name\ncarl\n")
+    assert data.read_cached(str(source), cache_path) is None
+
+
+def test_concurrent_writes(tmp_path):
+    source = tmp_path / "names.csv"
+    source.write_text("name\n")
+    cache_path = str(tmp_path / "cache" / "names.feather")
+    stamp = data.source_stamp(str(source))
+    tables = [pa.table({"value": list(range(i * 10_000, (i + 1) * 10_000))}) for i in range(8)]
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(lambda table: data.write_cached(table, cache_path, stamp), tables * 4))
+    cached = data.read_cached(str(source), cache_path)
+    # one of the entries, complete
+    assert any(cached["value"].tolist() == table.column("value").to_pylist() for table in tables)
+    assert os.listdir(tmp_path / "cache") == ["names.feather"]
+
+
+def dict_reader_records(path: str) -> list[Person]:
+    """The former loader of golden records: one `Person` per `csv.DictReader` line."""
+    with open(path, newline="") as f:
+        return [
+            Person(**{
+                **{name: value or None for name, value in line.items()},
+                "date_of_birth": datetime.date.fromisoformat(line["date_of_birth"]),
+                "sex": SEX_BY_CODE[SEX_BY_LABEL[line["sex"]]],
+            })
+            for line in csv.DictReader(f)
+        ]
+
+
+def without_empty_strings(person: Person) -> Person:
+    """CSV writes None and '' alike, both read back as None."""
+    return dataclasses.replace(person, **{
+        field.name: None for field in dataclasses.fields(person) if getattr(person, field.name) == ""
+    })
+
+
+@pytest.mark.parametrize("size", [1, 100, 5_000])
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_golden_records_round_trip(tmp_path, size, fmt):
+    persons = base_individuals_table(size, np.random.default_rng(size), fast_providers=True).to_persons()
+    nodes_path = str(tmp_path / f"nodes.{fmt}")
+    write_households(
+        [Household(members=[person], relationships=[]) for person in persons], nodes_path, str(tmp_path / f"edges.{fmt}"),
+    )
+    if fmt == "csv":
+        persons = [without_empty_strings(person) for person in persons]
+    assert data.load_golden_records(nodes_path) == persons
+    if fmt == "csv":
+        assert dict_reader_records(nodes_path) == persons
+    chunks = list(data.iter_golden_tables(nodes_path, chunk_rows=max(size // 3, 1)))
+    assert [person for chunk in chunks for person in chunk] == persons
+
+
+def test_golden_table_keeps_strings_in_arrow(tmp_path):
+    persons = base_individuals_table(1_000, np.random.default_rng(0), fast_providers=True).to_persons()
+    nodes_path = str(tmp_path / "nodes.parquet")
+    write_households([Household(members=[person], relationships=[]) for person in persons], nodes_path, str(tmp_path / "edges.parquet"))
+    table = data.load_golden_table(nodes_path)
+    assert isinstance(table.columns.raw("firstname"), pa.ChunkedArray)
+    assert len(table) == len(persons)
+
+    chunk = table[100:110]
+    assert isinstance(chunk.columns.raw("firstname"), pa.ChunkedArray)
+    # pickled chunks only carry their own rows
+    assert len(pickle.dumps(chunk)) < len(pickle.dumps(table)) / 20
+    assert pickle.loads(pickle.dumps(chunk)).to_persons() == persons[100:110]
+
+    picked = table[np.array([5, -1, 5])]
+    assert picked.firstname.tolist() == [persons[5].firstname, persons[-1].firstname, persons[5].firstname]
+    women = table[table.sex == Sex.FEMALE.value]
+    assert women.unique_id.tolist() == [person.unique_id for person in persons if person.sex == Sex.FEMALE]
+    assert table[::100].to_persons() == persons[::100]
+    assert table.to_arrow().column("firstname").to_pylist() == [person.firstname for person in persons]
+    # converted on access, once
+    assert isinstance(table.firstname, np.ndarray)
+    assert table.columns.raw("firstname") is table.firstname
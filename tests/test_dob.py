@@ -0,0 +1,63 @@
+import datetime
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from fakeidentities.noise.dob import DateOfBirthNoiser
+
+DATES = [
+    datetime.date(2000, 2, 29),
+    datetime.date(1999, 3, 5),
+    datetime.date(1999, 3, 12),
+    *[datetime.date(1999, 1, day) for day in range(27, 32)],
+]
+
+
+def off_year_only() -> DateOfBirthNoiser:
+    return DateOfBirthNoiser(p_swap_month_date=0, p_swap_days=0, p_off_year=1)
+
+
+def day_change_only() -> DateOfBirthNoiser:
+    return DateOfBirthNoiser(p_swap_month_date=0, p_swap_days=1, p_off_year=0)
+
+
+def batch(noiser: DateOfBirthNoiser, dates: list, seed: int = 0) -> list:
+    result = noiser.noise_many(np.array(dates, dtype="datetime64[D]"), np.random.default_rng(seed))
+    return [None if np.isnat(value) else value.item() for value in result]
+
+
+def test_missing_dates():
+    assert DateOfBirthNoiser().noise(None) is None
+    assert batch(DateOfBirthNoiser(), [None, datetime.date(1999, 3, 5), None]).count(None) == 2
+
+
+def test_leap_day_off_year():
+    random.seed(0)
+    scalar = {off_year_only().noise(datetime.date(2000, 2, 29)) for _ in range(50)}
+    assert scalar == {datetime.date(1999, 2, 28), datetime.date(2001, 2, 28)}
+    assert set(batch(off_year_only(), [datetime.date(2000, 2, 29)] * 50)) == scalar
+    # a leap year one year away keeps the leap day
+    assert set(batch(off_year_only(), [datetime.date(2003, 2, 28)] * 50)) == {
+        datetime.date(2002, 2, 28), datetime.date(2004, 2, 28),
+    }
+
+
+@pytest.mark.parametrize("day, expected", [(27, 27), (28, 28), (29, 29), (30, 3), (31, 13), (21, 12), (5, 6)])
+def test_day_change(day, expected):
+    original = datetime.date(1999, 1, day)
+    assert day_change_only().noise(original) == original.replace(day=expected)
+    assert batch(day_change_only(), [original]) == [original.replace(day=expected)]
+
+
+def test_batch_matches_scalar_distribution():
+    noiser = DateOfBirthNoiser()
+    copies = 4_000
+    random.seed(1)
+    for original in DATES:
+        scalar = Counter(noiser.noise(original) for _ in range(copies))
+        batched = Counter(batch(noiser, [original] * copies, seed=original.toordinal()))
+        assert scalar.keys() == batched.keys(), original
+        for value, count in scalar.items():
+            assert batched[value] / copies == pytest.approx(count / copies, abs=0.03), (original, value)
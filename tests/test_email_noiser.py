@@ -0,0 +1,82 @@
+import random
+
+import numpy as np
+import pytest
+
+from fakeidentities.noise.email_noiser import EmailNoiser, split_email
+
+EMAILS = [
+    "john.smith@gmail.com",
+    "john_smith@mail-server.co",
+    "jsmith@example.org",
+    "@gmail.com",
+    "john.smith",
+    "",
+    "john@smith@gmail.com",
+    "john.smith@localhost",
+    "john.smith@gmail.",
+]
+
+
+class FixedRng:
+    """Draws `u` for every decision, as the `fixed_random` fixture does for the scalar noiser."""
+
+    def __init__(self, u: float):
+        self.u = u
+
+    def random(self, shape):
+        return np.full(shape, self.u)
+
+
+@pytest.fixture
+def fixed_random(monkeypatch):
+    def fix(u: float):
+        monkeypatch.setattr(random, "random", lambda: u)
+        monkeypatch.setattr(random, "choice", lambda values: values[int(u * len(values))])
+    return fix
+
+
+def test_split_email():
+    assert split_email("john.smith@mail.example.com") == ("john.smith", "mail.example", "com")
+    assert split_email("john@smith@gmail.com") == ("john@smith", "gmail", "com")
+    assert split_email("@gmail.com") == ("", "gmail", "com")
+    assert split_email("john@localhost") == ("john", "localhost", None)
+    assert split_email("john@gmail.") == ("john", "gmail", "")
+
+
+@pytest.mark.parametrize("u", [0.99, 0.12, 0.07])
+def test_batch_matches_scalar(fixed_random, u):
+    # 0.99: no typo, 0.12: separator swap in the local part and a new extension, 0.07: also in the domain
+    fixed_random(u)
+    noiser = EmailNoiser()
+    scalar = [noiser.noise(email) for email in EMAILS]
+    batch = noiser.noise_many(np.array(EMAILS, dtype=object), FixedRng(u)).tolist()
+    assert batch == scalar
+    if u == 0.99:
+        assert scalar == EMAILS
+
+
+def test_edge_cases(fixed_random):
+    fixed_random(0.07)
+    noiser = EmailNoiser()
+    # not an email
+    assert noiser.noise("john.smith") == "john.smith"
+    assert noiser.noise("") == ""
+    # the local part keeps its "@", only the domain after the last "@" is noised
+    assert noiser.noise("john@smith@gmail.com") == "john@smith@gmail.com"
+    assert noiser.noise("a.b@smith@gmail.com") == "a-b@smith@gmail.com"
+    assert noiser.noise("@gmail.com") == "@gmail.com"
+    # no extension to replace
+    assert noiser.noise("john@localhost") == "john@localhost"
+    assert noiser.noise("john@mail-server") == "john@mail.server"
+
+
+def test_keyboard_typos():
+    noiser = EmailNoiser()
+    random.seed(0)
+    noised = noiser.noise_many(np.array(["christopher@gmail.com"] * 2_000, dtype=object), np.random.default_rng(0))
+    names = [email.split("@")[0] for email in noised.tolist()]
+    # 5% of keyboard typos, letters only
+    assert 0.03 < np.mean([name != "christopher" for name in names]) < 0.07
+    assert all(name.isalpha() and len(name) == len("christopher") for name in names)
+    assert noiser.noise_many(np.empty(0, dtype=object), np.random.default_rng(0)).tolist() == []
@@ -0,0 +1,41 @@
+import nicknames
+
+from fakeidentities.noise.first_name_model import CANONICALS, NICKNAMES, PHONETICS, VARIANTS, FirstNameModel
+from fakeidentities.phonetics import PhoneticDict
+
+
+def test_compile_with_default_nicknames():
+    phonetics = PhoneticDict()
+    for name in ("stephen", "steven", "stefan"):
+        phonetics += name
+    phonetics.freeze()
+    variants = {"stephen": {"steve", "stevie"}}
+
+    model = FirstNameModel.compile(variants, phonetics, names=["Zorblax"])
+
+    nicknamer = nicknames.NickNamer()
+    lookup = nicknames.default_lookup()
+    # golden names, canonical names and nicknames of the default table are all in the vocabulary
+    assert model.row("zorblax") is not None
+    assert model.row("nicholas") is not None
+    assert model.row("nick") is not None
+    assert len(model.rows) >= len(lookup)
+
+    nicholas = model.row("nicholas")
+    for _ in range(20):
+        assert model.sample(NICKNAMES, nicholas) in nicknamer.nicknames_of("nicholas")
+        assert model.sample(CANONICALS, model.row("nick")) in nicknamer.canonicals_of("nick")
+        assert model.sample(VARIANTS, model.row("stephen")) in {"steve", "stevie"}
+        assert model.sample(PHONETICS, model.row("stephen")) in set(phonetics.variants_of("stephen"))
+    assert model.sample(NICKNAMES, model.row("zorblax")) is None
+
+
+def test_save_and_load(tmp_path):
+    phonetics = PhoneticDict().freeze()
+    model = FirstNameModel.compile({}, phonetics, nickname_lookup={"alexander": {"al", "alex"}})
+    path = tmp_path / "model.npz"
+    model.save(str(path))
+    loaded = FirstNameModel.load(str(path))
+    assert loaded.names == model.names
+    assert loaded.num_rows == model.num_rows
+    assert loaded.sample(CANONICALS, loaded.row("alex")) == "alexander"
@@ -0,0 +1,51 @@
+import datetime
+import random
+
+import numpy as np
+from faker import Faker
+
+from fakeidentities.golden_records import base_individuals_table, iter_households, random_dates_of_birth
+from fakeidentities.person_table import PersonTable
+
+
+def test_dates_of_birth_on_leap_day():
+    today = datetime.date(2024, 2, 29)
+    dates = random_dates_of_birth(10_000, 18, 81, np.random.default_rng(1), today=today)
+    # 2024 - 82 and 2024 - 18 are not leap years: bounds are on Feb 28
+    assert dates.min() > np.datetime64("1942-02-28")
+    assert dates.max() <= np.datetime64("2006-02-28")
+
+
+def test_dates_of_birth_range():
+    today = datetime.date(2023, 6, 15)
+    dates = random_dates_of_birth(10_000, 18, 81, np.random.default_rng(1), today=today)
+    assert dates.dtype == np.dtype("datetime64[D]")
+    assert dates.min() > np.datetime64("1941-06-15")
+    assert dates.max() <= np.datetime64("2005-06-15")
+
+
+def households_of(individuals) -> list[tuple[list[str], list[tuple[str, str, str]]]]:
+    random.seed(3)
+    Faker.seed(3)
+    return [
+        ([p.unique_id for p in household.members], [(a.unique_id, b.unique_id, kind) for a, b, kind in household.relationships])
+        for household in iter_households(individuals)
+    ]
+
+
+def test_table_households_match_persons():
+    table = base_individuals_table(500, np.random.default_rng(2))
+    from_table = households_of(table)
+    assert from_table == households_of(table.to_persons())
+    assert any(relationships for _, relationships in from_table)
+    assert {uid for members, _ in from_table for uid in members} >= set(table.unique_id.tolist())
+
+
+def test_table_households_build_rows_lazily(monkeypatch):
+    table = base_individuals_table(500, np.random.default_rng(2))
+    rows = []
+    row = PersonTable.row
+    monkeypatch.setattr(PersonTable, "row", lambda self, i: rows.append(i) or row(self, i))
+    households = iter_households(table)
+    next(households)
+    assert len(rows) <= 2
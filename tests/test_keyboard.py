@@ -0,0 +1,90 @@
+import math
+import random
+
+import pytest
+
+from fakeidentities.noise.keyboard import QWERTY_NEIGHBOURS, KeyboardTypos
+
+# the configuration of the name and address noisers
+NAME_TYPOS = dict(aug_char_p=0.15, include_upper_case=False, aug_char_min=1, aug_char_max=3, min_char=4)
+
+
+def changed_positions(original: str, typo: str) -> list[int]:
+    assert len(typo) == len(original)
+    return [i for i, (a, b) in enumerate(zip(original, typo)) if a != b]
+
+
+@pytest.mark.parametrize("text", ["", " ", "abc de", "____ ....", "éèàü ñññ", "ÀÉÎÕ"])
+def test_nothing_to_replace(text):
+    typos = KeyboardTypos(**NAME_TYPOS)
+    random.seed(0)
+    assert all(typos.augment(text) == text for _ in range(20))
+
+
+def test_disabled_character_classes():
+    typos = KeyboardTypos(**NAME_TYPOS, include_special_char=False, include_numeric=False)
+    random.seed(0)
+    assert all(typos.augment(text) == text for text in ["1234 5678", "!@#$ %%%%"] for _ in range(20))
+    assert typos.augment("ab12") != "ab12"
+
+
+def test_replacements_are_adjacent_keys():
+    typos = KeyboardTypos(**NAME_TYPOS)
+    random.seed(0)
+    for text in ["Christopher", "jonathan", "4521 Lakeview Drive"] * 50:
+        typo = typos.augment(text)
+        for i in changed_positions(text, typo):
+            assert typo[i] in QWERTY_NEIGHBOURS[text[i]], (text, typo)
+
+
+def test_keeps_case():
+    typos = KeyboardTypos(**NAME_TYPOS)
+    random.seed(0)
+    for text in ["CHRISTOPHER", "Christopher", "christopher"] * 50:
+        typo = typos.augment(text)
+        for i in changed_positions(text, typo):
+            assert text[i].islower() and not typo[i].isupper(), (text, typo)
+    assert typos.augment("CHRISTOPHER") == "CHRISTOPHER"
+
+
+def test_upper_case_neighbours():
+    typos = KeyboardTypos(aug_char_p=1, aug_char_max=20)
+    random.seed(0)
+    typos_of_a = {typos.augment("aaaa")[0] for _ in range(200)}
+    # as in nlpaug, a lower case key can also be typed with shift
+    assert typos_of_a == {*"qwszx", *"QWASZX"}
+
+
+def test_neighbours_differ_from_nlpaug_on_u():
+    # nlpaug's keyboard table maps "u" to " t" and " T", which would insert spaces
+    assert "t" in KeyboardTypos().neighbours["u"]
+    assert not any(" " in candidate for candidates in KeyboardTypos().neighbours.values() for candidate in candidates)
+
+
+@pytest.mark.parametrize("word", ["anne", "jonathan", "christopher", "maximilianus", "abcdefghijklmnopqrstuvwxyz"])
+def test_replacement_count(word):
+    typos = KeyboardTypos(**NAME_TYPOS)
+    expected = min(max(math.ceil(0.15 * len(word)), 1), 3)
+    random.seed(0)
+    for _ in range(50):
+        assert len(changed_positions(word, typos.augment(word))) == expected
+
+
+def test_replacement_count_limited_by_mappable_characters():
+    typos = KeyboardTypos(aug_char_p=1, aug_char_min=1, aug_char_max=10, min_char=4)
+    random.seed(0)
+    # only "a" and "b" have neighbours
+    assert len(changed_positions("aéèb", typos.augment("aéèb"))) == 2
+
+
+def test_word_count_and_separators():
+    typos = KeyboardTypos(aug_char_p=0.1, aug_char_max=1, aug_word_p=0.3, aug_word_max=2)
+    text = "north lakeview, suite 2048 - port aaronshire"
+    random.seed(0)
+    for _ in range(50):
+        typo = typos.augment(text)
+        changed = changed_positions(text, typo)
+        # ceil(0.3 * 8 tokens) = 3 words, capped at 2, one character each
+        assert len(changed) == 2
+        assert all(text[i] not in " ,-" for i in changed)
+        assert len({text[:i].count(" ") for i in changed}) == 2
@@ -0,0 +1,29 @@
+import numpy as np
+
+from fakeidentities.ngram_index import NGramIndex
+
+NAMES = ["christopher", "jonathan", "katherine", "michael", "stephanie"]
+
+
+def test_nearest_with_threshold():
+    index = NGramIndex.build(NAMES)
+    assert index.nearest(["kathrine", "chirstopher", "xqzvw"], max_distance=0.7) == ["katherine", "christopher", None]
+
+
+def test_saved_index_checks_vocabulary(tmp_path):
+    path = str(tmp_path / "index.npz")
+    NGramIndex.build(NAMES).save(path)
+    loaded = NGramIndex.load(path)
+    assert loaded.matches_vocabulary(NAMES)
+    assert not loaded.matches_vocabulary(NAMES[:-1])
+    assert not loaded.matches_vocabulary(["anne", *NAMES[1:]])
+    assert loaded.nearest(["stephnie"], max_distance=0.7) == ["stephanie"]
+
+
+def test_index_without_vocabulary_stamp_does_not_match(tmp_path):
+    path = str(tmp_path / "index.npz")
+    index = NGramIndex.build(NAMES)
+    index.save(path)
+    with np.load(path) as arrays:
+        np.savez(path, names=arrays["names"], index=arrays["index"])
+    assert not NGramIndex.load(path).matches_vocabulary(NAMES)
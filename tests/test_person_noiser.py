@@ -0,0 +1,114 @@
+import math
+import random
+
+import numpy as np
+import pytest
+from faker import Faker
+
+from fakeidentities.golden_records import base_individuals_table
+from fakeidentities.noise.person import PersonNoiser
+from fakeidentities.parse.address_parser import ADDRESS_COLUMNS, address_columns, parse_address_cached
+from fakeidentities.person import Sex
+from fakeidentities.person_table import MISSING_SEX, PersonTable
+from fakeidentities.phonetics import PhoneticDict
+
+DUPLICATES = 10
+
+
+@pytest.fixture(scope="module")
+def originals() -> PersonTable:
+    random.seed(0)
+    Faker.seed(0)
+    return base_individuals_table(1_000, np.random.default_rng(0), fast_providers=True)
+
+
+@pytest.fixture(scope="module")
+def noiser() -> PersonNoiser:
+    phonetics = PhoneticDict().freeze()
+    return PersonNoiser({}, phonetics, phonetics, rng=np.random.default_rng(1))
+
+
+def present_rates(table: PersonTable, originals: PersonTable) -> dict[str, tuple[float, int]]:
+    """
+    Share of duplicates keeping each field that can be dropped, among originals where it is set,
+    with the number of duplicates it is measured on.
+    """
+    kept = {}
+    for name in ("prefix", "suffix", "personal_email", "corporate_email", "social_security_number", "phone"):
+        has_original = originals.columns[name].astype(bool)
+        kept[name] = table.columns[name][has_original].astype(bool)
+    kept["date_of_birth"] = ~np.isnat(table.date_of_birth)
+    sex = table.sex
+    kept["sex"] = sex != MISSING_SEX
+    kept["wrong_sex"] = sex[sex != MISSING_SEX] != originals.sex[sex != MISSING_SEX]
+    return {name: (values.mean(), len(values)) for name, values in kept.items()}
+
+
+def test_noise_rates_match_scalar(originals, noiser):
+    batch = noiser.noise_many(originals, DUPLICATES)
+    source = np.repeat(np.arange(len(originals)), DUPLICATES)
+    random.seed(2)
+    scalar = PersonTable.from_persons(noiser.noise(person) for person in originals[source])
+
+    batch_rates = present_rates(batch, originals[source])
+    scalar_rates = present_rates(scalar, originals[source])
+    for name, (rate, size) in scalar_rates.items():
+        # 4.5 standard deviations of the difference of two rates (at most 0.5 / sqrt(size) each)
+        assert batch_rates[name][0] == pytest.approx(rate, abs=4.5 * 0.5 * math.sqrt(2 / size)), name
+    assert batch_rates["social_security_number"][0] == pytest.approx(1 - noiser.p_missing_ssn, abs=0.03)
+    assert batch_rates["prefix"][0] == pytest.approx(noiser.p_missing_prefix, abs=0.1)
+
+
+def test_unnoised_fields_pass_through(originals, noiser):
+    batch = noiser.noise_many(originals, 3)
+    source = np.repeat(np.arange(len(originals)), 3)
+    assert len(batch) == 3 * len(originals)
+    assert batch.original_id.tolist() == originals.unique_id[source].tolist()
+    assert len(set(batch.unique_id.tolist())) == len(batch)
+    for name in ("prefix", "suffix", "social_security_number"):
+        kept = batch.columns[name].astype(bool)
+        assert batch.columns[name][kept].tolist() == originals.columns[name][source][kept].tolist()
+    kept_sex = batch.sex != MISSING_SEX
+    assert set(batch.sex[kept_sex].tolist()) <= {Sex.MALE.value, Sex.FEMALE.value}
+    assert batch.sex.dtype == np.int8
+
+
+def test_missing_columns(originals, noiser):
+    table = originals[:50]
+    empty = {"middlename", "prefix", "suffix", "corporate_email", "phone", "personal_email"}
+    columns = {
+        name: np.full(len(table), None, dtype=object) if name in empty else column
+        for name, column in table.columns.items()
+    }
+    columns["date_of_birth"] = np.full(len(table), np.datetime64("NaT", "D"), dtype="datetime64[D]")
+    batch = noiser.noise_many(PersonTable(columns), 2)
+    for name in empty:
+        assert all(value is None for value in batch.columns[name].tolist()), name
+    assert np.isnat(batch.date_of_birth).all()
+
+
+def test_per_row_duplicates_and_empty(originals, noiser):
+    counts = np.zeros(len(originals), dtype=int)
+    counts[[0, 5]] = [2, 1]
+    batch = noiser.noise_many(originals, counts)
+    assert batch.original_id.tolist() == [originals.unique_id[0]] * 2 + [originals.unique_id[5]]
+
+    assert len(noiser.noise_many(originals, 0)) == 0
+    assert len(noiser.noise_many(originals.to_persons()[:0], 3)) == 0
+
+
+def test_addresses_from_columns(originals):
+    table = originals[:100]
+    parsed = [address_columns(parse_address_cached(raw)) for raw in table.raw_address.tolist()]
+    with_columns = PersonTable({
+        **table.columns,
+        **{column: np.array([row[column] for row in parsed], dtype=object) for column in ADDRESS_COLUMNS.values()},
+    })
+    phonetics = PhoneticDict().freeze()
+    addresses = []
+    for golden in (table, with_columns):
+        random.seed(4)
+        noiser = PersonNoiser({}, phonetics, phonetics, rng=np.random.default_rng(4))
+        addresses.append(noiser.noise_many(golden, 3).raw_address.tolist())
+    assert addresses[0] == addresses[1]
+    assert all(addresses[1])
@@ -0,0 +1,45 @@
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from fakeidentities.noise.phone import PhoneNoiser
+
+
+@pytest.mark.parametrize("phone", ["", "1", "12", "(1)-2", "ext."])
+def test_short_numbers_are_kept(phone):
+    noiser = PhoneNoiser()
+    noiser.p_swap = 1
+    random.seed(0)
+    assert noiser.noise(phone) == phone
+    assert noiser.noise_many(np.array([phone], dtype=object), np.random.default_rng(0)).tolist() == [phone]
+
+
+def test_three_digits_swap_a_neighbour_of_the_middle_one():
+    noiser = PhoneNoiser()
+    noiser.p_swap = 1
+    random.seed(0)
+    scalar = {noiser.noise("1-2-3") for _ in range(50)}
+    batched = set(noiser.noise_many(np.array(["1-2-3"] * 50, dtype=object), np.random.default_rng(0)).tolist())
+    # two swaps of the middle digit with a neighbour
+    assert batched == scalar == {"1-2-3", "3-1-2", "2-3-1"}
+
+
+def test_only_digits_move():
+    phones = np.array(["(555) 123-4567", "+1-555-987-6543x210", "555.123.4567"] * 100, dtype=object)
+    noised = PhoneNoiser().noise_many(phones, np.random.default_rng(0))
+    for phone, noisy in zip(phones.tolist(), noised.tolist()):
+        assert sorted(noisy) == sorted(phone)
+        assert [c for c in noisy if not c.isdigit()] == [c for c in phone if not c.isdigit()]
+
+
+def test_batch_matches_scalar_distribution():
+    noiser = PhoneNoiser()
+    copies = 4_000
+    random.seed(1)
+    scalar = Counter(noiser.noise("123-4567") for _ in range(copies))
+    batched = Counter(noiser.noise_many(np.array(["123-4567"] * copies, dtype=object), np.random.default_rng(1)).tolist())
+    assert scalar["123-4567"] / copies == pytest.approx(batched["123-4567"] / copies, abs=0.03)
+    for value in set(scalar) | set(batched):
+        assert batched[value] / copies == pytest.approx(scalar[value] / copies, abs=0.02), value
@@ -0,0 +1,68 @@
+import random
+import re
+from collections import Counter
+
+import pytest
+from faker.providers.person.en_US import Provider as PersonProvider
+
+from fakeidentities.phonetics import PHONETIC_MAP, PHONETIC_REWRITER, PhoneticRewriter
+
+NAMES = sorted({*PersonProvider.first_names, *PersonProvider.last_names})
+NAMES = [*NAMES, *(name.lower() for name in NAMES)]
+# overlapping patterns: ee / e, ei / ie / i / e, tion / t, ght / t, ow / aw / w, ou / o / u
+OVERLAPPING = ["Heidie", "Keelee", "Caution", "Knight", "Lawrence", "Howard", "Shawnee", "Xochitl", "Eeeie"]
+ANCHORED_RULES = {"^kn": "n", "ph$": "f", "ph": "ff", "^a": "o", "e$": "y", "ee": "i"}
+
+
+def walk(name: str, rules: dict[str, str], p: float) -> str:
+    """The rule loop `PhoneticRewriter` replaces (with regex anchors for "^" / "$" rules)."""
+    for pattern, replacement in rules.items():
+        if random.random() < p:
+            anchored = re.escape(pattern.removeprefix("^").removesuffix("$"))
+            anchored = ("^" if pattern.startswith("^") else "") + anchored + ("$" if pattern.endswith("$") else "")
+            new_name = re.sub(anchored, lambda _: replacement, name)
+            if new_name != name:
+                return new_name
+    return name
+
+
+def outcomes(name: str, rules: dict[str, str]) -> set[str]:
+    """Every name the loop can produce: the name rewritten by each rule that changes it."""
+    result = set()
+    for i in range(len(rules)):
+        random.seed(0)
+        # only the i-th rule is tried
+        result.add(walk(name, dict([list(rules.items())[i]]), 1))
+    return result - {name}
+
+
+@pytest.mark.parametrize("rules, rewriter", [
+    (PHONETIC_MAP, PHONETIC_REWRITER), (ANCHORED_RULES, PhoneticRewriter(ANCHORED_RULES)),
+])
+def test_same_rewrites(rules, rewriter):
+    for name in [*NAMES, *OVERLAPPING, "kneeph", "apheph", "", "a"]:
+        applicable = rewriter.applicable(name)
+        assert {rewriter.apply(name, idx) for idx in applicable} == outcomes(name, rules), name
+        # the first rule that changes the name
+        assert rewriter.rewrite(name, 1) == walk(name, rules, 1), name
+        assert rewriter.rewrite(name, 0) == name
+
+
+@pytest.mark.parametrize("name", [*OVERLAPPING, "Stephen", "Christopher", "kneeph"])
+@pytest.mark.parametrize("rules", [PHONETIC_MAP, ANCHORED_RULES])
+def test_same_distribution(name, rules):
+    rewriter = PhoneticRewriter(rules)
+    draws = 4_000
+    random.seed(1)
+    expected = Counter(walk(name, rules, 0.5) for _ in range(draws))
+    actual = Counter(rewriter.rewrite(name, 0.5) for _ in range(draws))
+    assert actual.keys() <= expected.keys() | {name}
+    for value in expected.keys() | actual.keys():
+        assert actual[value] / draws == pytest.approx(expected[value] / draws, abs=0.03), value
+
+
+def test_anchored_rules():
+    rewriter = PhoneticRewriter(ANCHORED_RULES)
+    assert {rewriter.apply("knoph", idx) for idx in rewriter.applicable("knoph")} == {"noph", "knof", "knoff"}
+    # anchored rules do not apply inside the name
+    assert rewriter.applicable("aknaphe") == (2, 3, 4)
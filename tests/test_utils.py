@@ -0,0 +1,33 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from fakeidentities.utils import bounded_map, bounded_map_unordered
+
+
+def test_bounded_map_keeps_order():
+    with ThreadPoolExecutor(4) as executor:
+        assert list(bounded_map(executor, pow, range(20), [2] * 20, max_pending=3)) == [i ** 2 for i in range(20)]
+
+
+def test_bounded_map_consumes_inputs_lazily():
+    consumed = []
+    lock = threading.Lock()
+
+    def inputs():
+        for i in range(100):
+            with lock:
+                consumed.append(i)
+            yield i
+
+    with ThreadPoolExecutor(2) as executor:
+        results = bounded_map(executor, abs, inputs(), max_pending=4)
+        assert next(results) == 0
+        # the first result is yielded once the window is full, not after submitting everything
+        assert len(consumed) == 5
+        assert list(results) == list(range(1, 100))
+
+
+def test_bounded_map_unordered_returns_every_result():
+    with ThreadPoolExecutor(4) as executor:
+        results = bounded_map_unordered(executor, pow, range(50), [2] * 50, max_pending=3)
+        assert sorted(results) == [i ** 2 for i in range(50)]